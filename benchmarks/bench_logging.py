@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Throughput benchmark for the rootlog handler modes.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_logging.py --threads 1 8 64 --records 20000
+    PYTHONPATH=. python benchmarks/bench_logging.py --record-cost
+
+Each run configures rootlog against a temporary PY_LOG_PATH (console disabled) and
+reports records/second across all producer threads twice: caller side (until the last
+producer returned, which is what the queue and buffer modes speed up) and end to end
+(including draining the queue/buffers, bounded by the single writer thread), plus the
+mean time a producer spends inside each logging call.
+--record-cost instead compares the stdlib LogRecord with CompactLogRecord: memory per
+record waiting in the queue and time per record created by a logging call.
+"""
+import argparse
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextvars import ContextVar
+
+from rootlog import rootlog_config
+from rootlog.queueing import DeferredQueueHandler
+from rootlog.records import CompactLogRecord
+
+REQUEST_ID = ContextVar("request_id")
+TENANT = ContextVar("tenant")
+
+MODES = {
+    "direct": {},
+    "queue": {"use_queue": True},
+    "buffer": {"use_buffer": True},
+    "fsync-interval": {"durability": "interval", "durability_interval": 0.05},
+    "fsync-level": {"durability": "level"},
+    "fsync-group": {"durability": "group"},
+    "context": {"context_fields": [REQUEST_ID, TENANT], "format_f": "%(request_id)s %(tenant)s %(levelname)s %(message)s"},
+    "compact": {"compact_records": True},
+    "compact-queue": {"use_queue": True, "compact_records": True},
+    "context-queue": {"use_queue": True, "context_fields": [REQUEST_ID, TENANT], "format_f": "%(request_id)s %(tenant)s %(levelname)s %(message)s"},
+}
+
+
+def run(mode: str, threads: int, records: int, error_every: int = 100):
+    per_thread = records // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(thread_id):
+        REQUEST_ID.set(f"req-{thread_id}")
+        TENANT.set("acme")
+        barrier.wait()
+        for i in range(per_thread):
+            level = logging.ERROR if error_every and i % error_every == 0 else logging.INFO
+            logging.log(level, "thread %d record %d payload %s", thread_id, i, "x" * 64)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["PY_LOG_PATH"] = tmp
+        rootlog_config(app="bench", log_c=False, **MODES[mode])
+        workers = [threading.Thread(target=worker, args=[i]) for i in range(threads)]
+        for t in workers:
+            t.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for t in workers:
+            t.join()
+        produced = time.perf_counter() - start
+        for listener in getattr(logging.getLogger(), "_queue_listeners", []):
+            listener.stop()
+        for worker in getattr(logging.getLogger(), "_workers", []):
+            worker.stop()
+        elapsed = time.perf_counter() - start
+        logging.getLogger()._queue_listeners = []
+        for handler in logging.getLogger().handlers[:]:
+            handler.close()
+            logging.getLogger().removeHandler(handler)
+    total = per_thread * threads
+    # Producers run concurrently, so each call took roughly produced / per_thread
+    return total / produced, total / elapsed, produced / per_thread * 1e6
+
+
+def record_cost(factory, records: int):
+    """Return (bytes per queued record, microseconds per logging call that creates one)."""
+    logging.setLogRecordFactory(factory)
+    try:
+        log_queue = queue.Queue()
+        logger = logging.getLogger("bench.record_cost")
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        logger.handlers = [DeferredQueueHandler(log_queue)]
+
+        # Warm up caches (interned strings, queue blocks) before measuring
+        for i in range(1000):
+            logger.info("request %d from %s took %.1f ms", i, "user-42", 3.5)
+        while not log_queue.empty():
+            log_queue.get_nowait()
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(records):
+            logger.info("request %d from %s took %.1f ms", i, "user-42", 3.5)
+        per_record = (tracemalloc.get_traced_memory()[0] - before) / records
+        tracemalloc.stop()
+        while not log_queue.empty():
+            log_queue.get_nowait()
+
+        # Allocation time without the queue: the record is created and dropped by the handler
+        logger.handlers = [logging.NullHandler()]
+        start = time.perf_counter()
+        for i in range(records):
+            logger.info("request %d from %s took %.1f ms", i, "user-42", 3.5)
+        per_call = (time.perf_counter() - start) / records * 1e6
+        return per_record, per_call
+    finally:
+        logging.setLogRecordFactory(logging.LogRecord)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    parser.add_argument("--threads", nargs="+", type=int, default=[1, 8, 64])
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--error-every", type=int, default=100, help="log every Nth record at ERROR (0 for none)")
+    parser.add_argument("--record-cost", action="store_true", help="compare LogRecord and CompactLogRecord memory and allocation time")
+    args = parser.parse_args()
+
+    if args.record_cost:
+        print(f"{'record':<20}{'bytes/queued record':>22}{'us/call':>10}")
+        for factory in (logging.LogRecord, CompactLogRecord):
+            size, per_call = record_cost(factory, args.records)
+            print(f"{factory.__name__:<20}{size:>22,.0f}{per_call:>10.2f}")
+        return
+
+    print(f"{'mode':<16}{'threads':>8}{'caller rec/s':>14}{'end-to-end rec/s':>18}{'caller us/call':>16}")
+    for mode in args.modes:
+        for threads in args.threads:
+            caller_rate, rate, latency = run(mode, threads, args.records, args.error_every)
+            print(f"{mode:<16}{threads:>8}{caller_rate:>14,.0f}{rate:>18,.0f}{latency:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
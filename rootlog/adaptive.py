@@ -0,0 +1,134 @@
+import logging
+import threading
+import time
+from typing import Optional, Sequence
+
+from . import forksafe
+
+DEFAULT_STEPS = (logging.DEBUG, logging.INFO, logging.WARNING)
+
+
+class AdaptiveLevelController:
+    """Raise a logger's level step by step while the queue backs up, and restore it afterwards.
+
+    Every ``interval`` seconds the queue depth and the listener's sink latency are sampled.
+    At or above ``high_watermark`` (or ``max_latency``) the level goes up one step, e.g.
+    DEBUG -> INFO -> WARNING, so ``isEnabledFor`` drops the records before they are even
+    created. Only once the depth is back at ``low_watermark`` and the latency below half of
+    ``max_latency`` for ``cooldown`` seconds is the level lowered again, one step at a time.
+    Each change is logged as a WARNING record on the controlled logger.
+
+    Loggers with a level of their own never look at the controlled logger's level, and
+    ``remove_all_loggers`` gives every existing logger one. For the root logger the step is
+    therefore applied with ``logging.disable``, which every logger checks first; for a named
+    logger the explicit levels of its descendants are raised along with it. Both are put
+    back when the level is restored and on ``stop()``, and in forked children, which start
+    unthrottled with their own monitor thread watching their listener's new queue.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        log_queue,
+        listener=None,
+        high_watermark: int = 10000,
+        low_watermark: int = 1000,
+        max_latency: Optional[float] = 0.05,
+        steps: Sequence[int] = DEFAULT_STEPS,
+        interval: float = 0.1,
+        cooldown: float = 5.0,
+    ):
+        self.logger = logger
+        self.queue = log_queue
+        self.listener = listener
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.max_latency = max_latency
+        self.base_level = logger.level
+        self.steps = [self.base_level] + [level for level in steps if level > self.base_level]
+        self.interval = interval
+        self.cooldown = cooldown
+        self.step = 0
+        self._base_disable = logger.manager.disable
+        # Original explicit levels of descendant loggers raised along with a named logger
+        self._child_levels = {}
+        self._last_change = time.monotonic()
+        self._stop_event = threading.Event()
+        self._thread = None
+        if listener is not None:
+            listener.track_latency = True
+        forksafe.register(self)
+
+    def _after_fork_in_child(self):
+        # The parent's throttling was inherited, but no thread here would ever lower it again
+        self._stop_event = threading.Event()
+        if self.step:
+            self.step = 0
+            self._apply(self.base_level)
+        self._last_change = time.monotonic()
+        if self.listener is not None:
+            # ForkSafeQueueListener gave the child a fresh queue (its hook ran first)
+            self.queue = self.listener.queue
+        if self._thread is not None:
+            self._thread = None
+            self.start()
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._monitor, name="rootlog-adaptive", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        if self.step:
+            self.step = 0
+            self._apply(self.base_level)
+
+    def _monitor(self):
+        while not self._stop_event.wait(self.interval):
+            self.check()
+
+    def check(self):
+        """Sample the backlog once and move the level by at most one step."""
+        depth = self.queue.qsize()
+        latency = getattr(self.listener, "latency", 0.0)
+        slow = self.max_latency is not None and latency > self.max_latency
+        now = time.monotonic()
+        if (depth >= self.high_watermark or slow) and self.step < len(self.steps) - 1:
+            self._change(self.step + 1, now, depth, latency)
+        elif self.step and depth <= self.low_watermark and not (self.max_latency is not None and latency > self.max_latency / 2):
+            if now - self._last_change >= self.cooldown:
+                self._change(self.step - 1, now, depth, latency)
+        elif self.step:
+            # Still under pressure: keep the hysteresis timer running from the last pressured sample
+            self._last_change = now
+
+    def _change(self, step: int, now: float, depth: int, latency: float):
+        raised = step > self.step
+        self.step = step
+        self._last_change = now
+        level = self.steps[step]
+        self._apply(level)
+        self.logger.warning(
+            "Adaptive logging %s level to %s (queue depth %d, sink latency %.1f ms)",
+            "raised" if raised else "restored",
+            logging.getLevelName(level),
+            depth,
+            latency * 1000,
+        )
+
+    def _apply(self, level: int):
+        self.logger.setLevel(level)
+        if isinstance(self.logger, logging.RootLogger):
+            logging.disable(level - 1 if self.step else self._base_disable)
+            return
+        prefix = f"{self.logger.name}."
+        for name, child in list(self.logger.manager.loggerDict.items()):
+            if name.startswith(prefix) and isinstance(child, logging.Logger) and child.level != logging.NOTSET:
+                original = self._child_levels.setdefault(child, child.level)
+                child.setLevel(max(original, level) if self.step else original)
+        if not self.step:
+            self._child_levels.clear()
@@ -0,0 +1,144 @@
+import atexit
+import heapq
+import logging
+import threading
+from collections import deque
+from typing import List
+
+from . import forksafe
+from .queueing import prepare_record
+
+
+class _ThreadBuffer:
+    """Per-thread record buffer. Only the owning thread appends, only the writer pops."""
+
+    __slots__ = ("records", "thread")
+
+    def __init__(self, thread: threading.Thread):
+        self.records = deque()
+        self.thread = thread
+
+
+class BufferedHandler(logging.Handler):
+    """Handler that appends records to a thread-local buffer without taking any lock.
+
+    Records are drained by a ``BufferedListener`` writer thread. The shared registry lock
+    is only taken the first time a thread logs, never on the per-record path.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._local = threading.local()
+        self._buffers = []
+        self._registry_lock = threading.Lock()
+        forksafe.register(self)
+
+    def _after_fork_in_child(self):
+        # Pending records belong to the parent, which writes them out itself
+        self._local = threading.local()
+        self._buffers = []
+        self._registry_lock = threading.Lock()
+
+    def _get_buffer(self) -> _ThreadBuffer:
+        buffer = _ThreadBuffer(threading.current_thread())
+        with self._registry_lock:
+            self._buffers.append(buffer)
+        self._local.buffer = buffer
+        return buffer
+
+    def handle(self, record):
+        # Skip Handler.handle(): it would acquire the handler lock on every record
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def emit(self, record):
+        try:
+            buffer = self._local.buffer
+        except AttributeError:
+            buffer = self._get_buffer()
+        # deque.append is atomic, so the writer can popleft concurrently
+        buffer.records.append(prepare_record(record))
+
+    def swap_buffers(self) -> List[List[logging.LogRecord]]:
+        """Drain every thread buffer and return one ordered batch per thread."""
+        with self._registry_lock:
+            buffers = self._buffers[:]
+        batches = []
+        for buffer in buffers:
+            records = buffer.records
+            batch = []
+            try:
+                while True:
+                    batch.append(records.popleft())
+            except IndexError:
+                pass
+            if batch:
+                batches.append(batch)
+            elif not buffer.thread.is_alive():
+                self._forget(buffer)
+        return batches
+
+    def _forget(self, buffer: _ThreadBuffer):
+        with self._registry_lock:
+            if buffer in self._buffers and not buffer.records:
+                self._buffers.remove(buffer)
+
+
+class BufferedListener:
+    """Writer thread that periodically merges thread buffers in timestamp order into the sinks.
+
+    It mirrors the ``QueueListener`` interface (``start``/``stop``) so it can be stored and
+    stopped the same way by callers of ``rootlog_config``.
+    """
+
+    def __init__(self, buffer_handler: BufferedHandler, *handlers, interval: float = 0.05, respect_handler_level: bool = True):
+        self.buffer_handler = buffer_handler
+        self.handlers = handlers
+        self.interval = interval
+        self.respect_handler_level = respect_handler_level
+        self._stop_event = threading.Event()
+        self._thread = None
+        forksafe.register(self)
+
+    def _after_fork_in_child(self):
+        running = self._thread is not None
+        self._stop_event = threading.Event()
+        self._thread = None
+        if running:
+            self.start()
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = t = threading.Thread(target=self._monitor, name="rootlog-buffer-writer", daemon=True)
+        t.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        atexit.unregister(self.stop)
+
+    def flush(self):
+        """Write out everything buffered so far, merged by ``record.created``."""
+        batches = self.buffer_handler.swap_buffers()
+        if not batches:
+            return
+        # Each batch is already ordered, heapq.merge keeps the per-thread order on ties
+        records = batches[0] if len(batches) == 1 else heapq.merge(*batches, key=lambda r: r.created)
+        for record in records:
+            self.handle(record)
+
+    def handle(self, record):
+        for handler in self.handlers:
+            if not self.respect_handler_level or record.levelno >= handler.level:
+                handler.handle(record)
+
+    def _monitor(self):
+        while not self._stop_event.wait(self.interval):
+            self.flush()
+        # Final drain so nothing buffered before stop() is lost
+        self.flush()
@@ -3,17 +3,25 @@ import logging
 import os
 import queue
 import re
-from logging.handlers import (
-    QueueHandler,
-    QueueListener,
-    RotatingFileHandler,
-    TimedRotatingFileHandler,
-)
+from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
 from pathlib import Path
-from typing import Optional, Union
+from typing import List, Optional, Tuple, Union
 
 import colorlog
 
+from . import forksafe
+from .adaptive import AdaptiveLevelController
+from .buffered import BufferedHandler, BufferedListener
+from .context import ContextFields, ContextFilter
+from .durability import DurableFileHandler
+from .formatters import FoldingColoredFormatter, FoldingFormatter
+from .network import create_sink_handler
+from .queueing import DeferredQueueHandler, ForkSafeQueueListener
+from .records import CompactLogRecord
+from .resilient import ResilientFileHandler
+from .retention import RetentionJanitor
+from .rollup import RollupFilter
+
 
 # todo: replace os.path.join with pathlib.Path
 def remove_all_loggers():
@@ -93,9 +101,13 @@ def _create_file_handler(
     rotation: Optional[Union[str, int]],
     level_f: int,
     format_f: str,
+    shard: Optional[str] = None,
 ):
     """Create appropriate file handler based on rotation configuration."""
     base_name = "testing" if is_testing else datetime.datetime.now().strftime("%Y%m%d-%H")
+    if shard:
+        # Per-process shard: YYYYMMDD-HH.<pid or worker id>.log
+        base_name = f"{base_name}.{shard}"
 
     if rotation is None:
         # Default hourly rotation (existing behavior)
@@ -157,6 +169,31 @@ def rootlog_config(
     log_f: bool = True,
     rotation: Optional[Union[str, int]] = None,
     use_queue: bool = False,
+    use_buffer: bool = False,
+    buffer_interval: float = 0.05,
+    sinks: Optional[List[Union[str, logging.Handler]]] = None,
+    max_total_size: Optional[Union[str, int]] = None,
+    max_age: Optional[Union[str, int, float]] = None,
+    retention_scope: str = "app",
+    retention_interval: float = 300.0,
+    resilient: bool = True,
+    per_process: Union[bool, str] = False,
+    fold_exc_c: bool = False,
+    fold_exc_f: bool = False,
+    fold_window: float = 60.0,
+    adaptive: bool = False,
+    adaptive_watermarks: Tuple[int, int] = (10000, 1000),
+    adaptive_latency: Optional[float] = 0.05,
+    durability: str = "none",
+    durability_interval: float = 1.0,
+    durability_level: int = logging.ERROR,
+    context_fields: Optional[ContextFields] = None,
+    context_default: str = "-",
+    rollup_loggers: Optional[List[str]] = None,
+    rollup_level: Optional[int] = None,
+    rollup_window: float = 60.0,
+    rollup_stats: bool = False,
+    compact_records: bool = False,
 ) -> Optional[logging.Logger]:
     # The env is set to "true" in the pytest fixture for testing purposes
     #
@@ -171,44 +208,83 @@ def rootlog_config(
         logger = logging.getLogger(logger_name)  # Get specific logger only if logger name is provided (don't use module name __name__ or other names)
     else:
         logger = logging.getLogger()  # Get root logger if no logger name is provided
+    # Stop background workers (janitors, adaptive controllers) from a previous call
+    for worker in getattr(logger, "_workers", []):
+        worker.stop()
+    logger._workers = []
     logger.setLevel(min(level_c, level_f))
+    if compact_records:
+        # Slotted records with lazy attributes: less memory per record, especially while queued
+        logging.setLogRecordFactory(CompactLogRecord)
+    elif logging.getLogRecordFactory() is CompactLogRecord:
+        logging.setLogRecordFactory(logging.LogRecord)
     if logger.hasHandlers():
         logger.handlers.clear()  # Prevent duplicate logs
     # Set up handlers list for potential queue listener
     handlers = []
+    # Queue and buffer modes attach the sinks to a background writer instead of the logger
+    deferred = use_queue or use_buffer
 
     if log_c:
         console_handler = colorlog.StreamHandler()
-        console_formatter = colorlog.ColoredFormatter(
-            f"%(log_color)s{format_c}",
-            log_colors={
-                "DEBUG": "cyan",
-                "INFO": "green",
-                "WARNING": "yellow",
-                "ERROR": "red",
-                "CRITICAL": "bold_red",
-            },
-        )
+        log_colors = {
+            "DEBUG": "cyan",
+            "INFO": "green",
+            "WARNING": "yellow",
+            "ERROR": "red",
+            "CRITICAL": "bold_red",
+        }
+        if fold_exc_c:
+            # Write repeated tracebacks once per window, then as short reference lines
+            console_formatter = FoldingColoredFormatter(f"%(log_color)s{format_c}", log_colors=log_colors, fold_window=fold_window)
+        else:
+            console_formatter = colorlog.ColoredFormatter(f"%(log_color)s{format_c}", log_colors=log_colors)
         console_handler.setFormatter(console_formatter)
         console_handler.setLevel(level_c)
         handlers.append(console_handler)
 
-        if not use_queue:
+        if not deferred:
             logger.addHandler(console_handler)
 
+    log_base = Path(script).stem if script else app or "default"
+    py_log_path = Path(os.getenv("PY_LOG_PATH", Path.home() / "python-log"))
+    log_dir = py_log_path / log_base
+    file_sink = None
+
     if log_f:
         try:
             # Create log directory if it doesn't exist
-            log_base = Path(script).stem if script else app or "default"
-            py_log_path = Path(os.getenv("PY_LOG_PATH", Path.home() / "python-log"))
-            log_dir = py_log_path / log_base
             log_dir.mkdir(parents=True, exist_ok=True)
 
+            shard = None
+            file_format = format_f
+            if per_process:
+                # One file per process (pid or the given worker id), timestamped for rootlog-merge
+                shard = per_process if isinstance(per_process, str) else str(os.getpid())
+                if not file_format.startswith("%(asctime)s"):
+                    file_format = f"%(asctime)s {file_format}"
+
             # Determine file handler type based on rotation parameter
-            file_handler = _create_file_handler(log_dir, is_testing, rotation, level_f, format_f)
+            file_handler = _create_file_handler(log_dir, is_testing, rotation, level_f, file_format, shard=shard)
+            # Forked children (multiprocessing, gunicorn, celery) reopen the file on their own handle
+            forksafe.register_file_handler(file_handler, per_process=bool(per_process), shard=shard)
+            if resilient:
+                # Spill to memory and recover on write failures instead of calling handleError per record
+                file_handler = ResilientFileHandler(file_handler)
+                file_handler.setLevel(level_f)
+                file_handler.setFormatter(logging.Formatter(file_format))
+            if fold_exc_f:
+                file_handler.setFormatter(FoldingFormatter(file_format, fold_window=fold_window))
+            if durability != "none":
+                # Force records to disk per interval, per ERROR, or per shared (group) commit
+                file_handler = DurableFileHandler(file_handler, mode=durability, interval=durability_interval, level=durability_level)
+                file_handler.setLevel(level_f)
+                file_handler.start()
+                logger._workers.append(file_handler)
             handlers.append(file_handler)
+            file_sink = file_handler
 
-            if not use_queue:
+            if not deferred:
                 logger.addHandler(file_handler)
 
         except (OSError, PermissionError) as e:
@@ -223,20 +299,86 @@ def rootlog_config(
                 logger.addHandler(basic_handler)
                 logging.warning(f"Failed to set up file logging: {e}. Falling back to basic console logging.")
 
+    if log_f and (max_total_size is not None or max_age is not None):
+        janitor = RetentionJanitor(
+            py_log_path if retention_scope == "all" else log_dir,
+            max_bytes=max_total_size,
+            max_age=max_age,
+            interval=retention_interval,
+            protect=[h.baseFilename for h in handlers if isinstance(h, (logging.FileHandler, ResilientFileHandler, DurableFileHandler))],
+        )
+        janitor.start()
+        logger._workers.append(janitor)
+
+    # Network sinks ship records with the file level and format
+    for sink in sinks or []:
+        if isinstance(sink, logging.Handler):
+            sink_handler = sink
+        else:
+            sink_handler = create_sink_handler(sink, app_name=log_base, spill_dir=log_dir / ".spill")
+            sink_handler.setLevel(level_f)
+            sink_handler.setFormatter(logging.Formatter(format_f))
+        handlers.append(sink_handler)
+
+        if not deferred:
+            logger.addHandler(sink_handler)
+
+    # Set up thread-local buffered logging if requested (takes precedence over the queue)
+    if use_buffer and handlers:
+        buffer_handler = BufferedHandler()
+        logger.addHandler(buffer_handler)
+
+        # Start the writer thread that merges the per-thread buffers into the sinks
+        listener = BufferedListener(buffer_handler, *handlers, interval=buffer_interval, respect_handler_level=True)
+        listener.start()
+
+        if not hasattr(logger, "_queue_listeners"):
+            logger._queue_listeners = []
+        logger._queue_listeners.append(listener)
+
     # Set up queue-based logging if requested
-    if use_queue and handlers:
+    elif use_queue and handlers:
         log_queue = queue.Queue()
-        queue_handler = QueueHandler(log_queue)
+        queue_handler = DeferredQueueHandler(log_queue)
         logger.addHandler(queue_handler)
 
         # Start queue listener in a separate thread
-        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener = ForkSafeQueueListener(queue_handler, *handlers, respect_handler_level=True)
         listener.start()
 
         # Store listener reference to prevent garbage collection
         if not hasattr(logger, "_queue_listeners"):
             logger._queue_listeners = []
         logger._queue_listeners.append(listener)
+
+        if adaptive:
+            # Shed low-priority records at isEnabledFor when the backlog grows
+            high, low = adaptive_watermarks
+            controller = AdaptiveLevelController(logger, log_queue, listener, high_watermark=high, low_watermark=low, max_latency=adaptive_latency)
+            controller.start()
+            logger._workers.append(controller)
+
+    if rollup_loggers is not None or rollup_level is not None:
+        if file_sink is None:
+            logging.warning("Rollup summaries are written to the log file, which is disabled. Continuing without rollup.")
+        else:
+            # Count selected records on the producer and drop them before formatting or queueing
+            rollup = RollupFilter(file_sink, loggers=rollup_loggers, level=rollup_level, window=rollup_window, stats=rollup_stats)
+            for handler in logger.handlers:
+                handler.addFilter(rollup)
+            rollup.start()
+            logger._workers.append(rollup)
+
+    if context_fields:
+        # Capture the contextvars once per record on the producer side; sinks and wrapped handlers reuse the values
+        context_filter = ContextFilter(context_fields, default=context_default)
+        for handler in {*logger.handlers, *handlers}:
+            while handler is not None:
+                handler.addFilter(context_filter)
+                handler = getattr(handler, "target", None)
+
+    if adaptive and not any(isinstance(worker, AdaptiveLevelController) for worker in logger._workers):
+        logging.warning("adaptive=True only applies to use_queue=True logging. Continuing without it.")
     if logger_name:
         return logger
     else:
@@ -0,0 +1,42 @@
+import logging
+from contextvars import ContextVar
+from typing import Any, Mapping, Sequence, Union
+
+ContextFields = Union[Sequence[ContextVar], Mapping[str, ContextVar]]
+# Names a field would overwrite on the record; Logger.makeRecord refuses the same ones for ``extra``
+_RESERVED = frozenset(logging.LogRecord("", logging.INFO, "", 0, "", (), None).__dict__) | {"message", "asctime", "context_fields"}
+
+
+class ContextFilter(logging.Filter):
+    """Copy the current values of some ``ContextVar``s onto each record as plain attributes.
+
+    The values are read once, on the thread (or asyncio task) that logs, with one
+    ``ContextVar.get`` per field straight into ``record.__dict__``: no dict or adapter is
+    allocated per call, and the attributes travel with the record through queue and buffer
+    hops. They are usable as format fields (``%(request_id)s``) and are added as keys by the
+    JSON sinks; ``record.context_fields`` lists their names. Unset variables get ``default``.
+
+    The filter can sit on every handler a record passes through: only the first one captures,
+    so handlers further down (or on the listener thread) keep the producer's values.
+    """
+
+    def __init__(self, fields: ContextFields, default: Any = "-"):
+        super().__init__()
+        if isinstance(fields, Mapping):
+            self._pairs = tuple(fields.items())
+        else:
+            self._pairs = tuple((var.name, var) for var in fields)
+        clashes = sorted(name for name, _ in self._pairs if name in _RESERVED)
+        if clashes:
+            raise ValueError(f"Context field names clash with LogRecord attributes: {', '.join(clashes)}")
+        self.names = tuple(name for name, _ in self._pairs)
+        self.default = default
+
+    def filter(self, record):
+        attrs = record.__dict__
+        if "context_fields" not in attrs:
+            default = self.default
+            for name, var in self._pairs:
+                attrs[name] = var.get(default)
+            attrs["context_fields"] = self.names
+        return True
@@ -0,0 +1,152 @@
+import logging
+import os
+import threading
+
+from . import forksafe
+
+DURABILITY_MODES = ("none", "interval", "level", "group")
+
+
+class DurableFileHandler(logging.Handler):
+    """Fsync a file sink according to a durability mode.
+
+    Wraps the file handler (or the ``ResilientFileHandler`` around it) and leaves the writing
+    to it; this only decides when the written bytes are forced to disk:
+
+    - ``interval``: a background thread fsyncs every ``interval`` seconds if anything was written.
+    - ``level``: every record at ``level`` or above is fsynced before the logging call returns.
+    - ``group``: like ``level``, but concurrent callers share fsyncs. A caller waits for the next
+      fsync that starts after its record was written; whoever finds no fsync running performs it
+      for everyone waiting, so N threads logging errors at once cost about two fsyncs, not N.
+
+    The fsync runs on a duplicate of the file descriptor outside the handler lock, so other
+    threads keep writing meanwhile and a rollover cannot pull the file out from under it.
+    """
+
+    def __init__(self, target: logging.Handler, mode: str = "group", interval: float = 1.0, level: int = logging.ERROR):
+        if mode not in DURABILITY_MODES or mode == "none":
+            raise ValueError(f"Invalid durability mode: {mode}")
+        super().__init__()
+        self.target = target
+        self.mode = mode
+        self.interval = interval
+        self.sync_level = level
+        self.syncs = 0
+        self._dirty = False
+        self._init_state()
+        self._thread = None
+        forksafe.register(self)
+
+    def _init_state(self):
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+        self._syncing = False
+        self._started = 0
+        self._done = 0
+
+    def _after_fork_in_child(self):
+        # Locks may have been held by parent threads; the interval thread did not survive the fork
+        self._init_state()
+        if self._thread is not None:
+            self._thread = None
+            self.start()
+
+    @property
+    def baseFilename(self) -> str:
+        return self.target.baseFilename
+
+    def start(self):
+        if self.mode == "interval" and self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._sync_periodically, name="rootlog-fsync", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        if self._dirty:
+            self.sync()
+
+    def _sync_periodically(self):
+        while not self._stop_event.wait(self.interval):
+            if self._dirty:
+                self.sync()
+
+    def setFormatter(self, fmt):
+        self.target.setFormatter(fmt)
+
+    def handle(self, record):
+        # The target takes its own lock; waiting for the fsync happens after it is released
+        rv = self.filter(record)
+        if isinstance(rv, logging.LogRecord):
+            record = rv
+        if rv:
+            self.target.handle(record)
+            self._dirty = True
+            if record.levelno >= self.sync_level:
+                if self.mode == "level":
+                    self.sync()
+                elif self.mode == "group":
+                    self.group_commit()
+        return rv
+
+    def emit(self, record):
+        self.handle(record)
+
+    def _file_handler(self) -> logging.FileHandler:
+        return getattr(self.target, "target", self.target)
+
+    def sync(self):
+        """Fsync everything written so far."""
+        self._dirty = False
+        file_handler = self._file_handler()
+        self.target.acquire()
+        try:
+            stream = file_handler.stream
+            fd = os.dup(stream.fileno()) if stream is not None else None
+        except (OSError, ValueError):
+            fd = None
+        finally:
+            self.target.release()
+        if fd is None:
+            return
+        try:
+            os.fsync(fd)
+            self.syncs += 1
+        except OSError:
+            # A failing disk is the ResilientFileHandler's to report; don't raise into the caller
+            pass
+        finally:
+            os.close(fd)
+
+    def group_commit(self):
+        """Wait until an fsync that started after this call has finished, performing it if nobody is."""
+        with self._cond:
+            # An fsync already running may have missed our record: we need the one after it
+            needed = self._started + 1
+            while self._done < needed:
+                if self._syncing:
+                    self._cond.wait()
+                    continue
+                self._syncing = True
+                self._started += 1
+                generation = self._started
+                self._cond.release()
+                try:
+                    self.sync()
+                finally:
+                    self._cond.acquire()
+                    self._syncing = False
+                    self._done = generation
+                    self._cond.notify_all()
+
+    def flush(self):
+        self.target.flush()
+
+    def close(self):
+        self.stop()
+        self.target.close()
+        super().close()
+
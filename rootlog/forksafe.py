@@ -0,0 +1,88 @@
+import itertools
+import logging
+import os
+import weakref
+from pathlib import Path
+from typing import Optional
+
+# Objects implementing _after_fork_in_child() (listeners, buffered and network handlers), in registration order
+_hooks = weakref.WeakValueDictionary()
+_order = itertools.count()
+# FileHandlers to reopen in the child, mapped to (per_process, current shard suffix)
+_file_handlers = weakref.WeakKeyDictionary()
+_installed = False
+
+
+def _install():
+    global _installed
+    if _installed or not hasattr(os, "register_at_fork"):
+        return
+    os.register_at_fork(before=_before_fork, after_in_child=_after_fork_in_child)
+    _installed = True
+
+
+def register(obj):
+    """Call ``obj._after_fork_in_child()`` in every child forked from now on.
+
+    Hooks run in registration order, so an object sees the state of the ones it was built on
+    (e.g. a controller created after its queue listener sees the listener's new queue).
+    """
+    _install()
+    if not any(hook is obj for hook in _hooks.values()):
+        _hooks[next(_order)] = obj
+
+
+def register_file_handler(handler: logging.FileHandler, per_process: bool = False, shard: Optional[str] = None):
+    """Reopen ``handler``'s stream in forked children, as ``<name>.<pid>.log`` if ``per_process``.
+
+    ``shard`` is the suffix the parent's file already carries, replaced by the child's pid.
+    """
+    _install()
+    _file_handlers[handler] = (per_process, shard)
+
+
+def per_process_filename(filename: str, pid: int, shard: Optional[str] = None) -> str:
+    """Return ``filename`` with the pid inserted before the suffix: app.log -> app.1234.log."""
+    path = Path(filename)
+    stem = path.stem
+    if shard and stem.endswith(f".{shard}"):
+        stem = stem[: -len(shard) - 1]
+    return str(path.with_name(f"{stem}.{pid}{path.suffix}"))
+
+
+def _before_fork():
+    # Don't let the child inherit (and later write out again) data still buffered in the parent
+    for handler in list(_file_handlers):
+        stream = getattr(handler, "stream", None)
+        if stream is not None:
+            try:
+                stream.flush()
+            except (OSError, ValueError):
+                pass
+
+
+def _after_fork_in_child():
+    for handler, (per_process, shard) in list(_file_handlers.items()):
+        try:
+            _reopen(handler, per_process, shard)
+        except Exception:
+            pass
+    for _, obj in sorted(_hooks.items()):
+        try:
+            obj._after_fork_in_child()
+        except Exception:
+            pass
+
+
+def _reopen(handler: logging.FileHandler, per_process: bool, shard: Optional[str]):
+    stream, handler.stream = handler.stream, None
+    if stream is not None:
+        try:
+            stream.close()
+        except (OSError, ValueError):
+            pass
+    if per_process:
+        pid = os.getpid()
+        handler.baseFilename = per_process_filename(handler.baseFilename, pid, shard)
+        _file_handlers[handler] = (per_process, str(pid))
+    # The stream is opened lazily by the next write (FileHandler.emit / ResilientFileHandler)
@@ -0,0 +1,98 @@
+import logging
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+import colorlog
+
+
+def exception_fingerprint(ei) -> str:
+    """Fingerprint an exception by its type and code locations, including chained exceptions."""
+    parts = []
+    exc = ei[1]
+    tb = ei[2]
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        parts.append(type(exc).__qualname__)
+        while tb is not None:
+            code = tb.tb_frame.f_code
+            parts.append(f"{code.co_filename}:{code.co_name}:{tb.tb_lineno}")
+            tb = tb.tb_next
+        exc = exc.__cause__ or (None if exc.__suppress_context__ else exc.__context__)
+        tb = exc.__traceback__ if exc is not None else None
+    return f"{zlib.crc32('|'.join(parts).encode()):08x}"
+
+
+class ExceptionFoldingMixin:
+    """Formatter mixin that writes a traceback in full only once per ``fold_window`` seconds.
+
+    Tracebacks are fingerprinted by code locations. The first occurrence in a window is
+    rendered in full (and cached, so identical exceptions are not rendered again) with a
+    ``[exception <fingerprint>]`` tag; later occurrences in the window are folded into a
+    single reference line with the fingerprint and the running count.
+    """
+
+    fold_window = 60.0
+    cache_size = 256
+
+    def _folding_state(self):
+        try:
+            return self._fold_state
+        except AttributeError:
+            self._fold_state = (threading.Lock(), {}, OrderedDict())
+            return self._fold_state
+
+    def format(self, record):
+        if not record.exc_info:
+            return super().format(record)
+        # logging.Formatter caches exc_text on the record, which every sink shares
+        exc_text, record.exc_text = record.exc_text, None
+        try:
+            return super().format(record)
+        finally:
+            record.exc_text = exc_text
+
+    def formatException(self, ei):
+        lock, windows, cache = self._folding_state()
+        fingerprint = exception_fingerprint(ei)
+        now = time.monotonic()
+        with lock:
+            window = windows.get(fingerprint)
+            if window is not None and now - window[0] < self.fold_window:
+                window[1] += 1
+                message = str(ei[1]).split("\n", 1)[0]
+                return f"{type(ei[1]).__name__}: {message} [repeated exception {fingerprint}, {window[1]} times in the last {now - window[0]:.0f}s]"
+            windows[fingerprint] = [now, 1]
+            if len(windows) > self.cache_size:
+                # Forget fingerprints whose window has passed
+                for stale in [k for k, (start, _) in windows.items() if now - start >= self.fold_window]:
+                    del windows[stale]
+            key = (fingerprint, str(ei[1]))
+            text = cache.get(key)
+            if text is not None:
+                cache.move_to_end(key)
+                return text
+        text = f"{super().formatException(ei)}\n[exception {fingerprint}]"
+        with lock:
+            cache[key] = text
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        return text
+
+
+class FoldingFormatter(ExceptionFoldingMixin, logging.Formatter):
+    """``logging.Formatter`` with duplicate-exception folding, used for the file sink."""
+
+    def __init__(self, *args, fold_window: float = 60.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fold_window = fold_window
+
+
+class FoldingColoredFormatter(ExceptionFoldingMixin, colorlog.ColoredFormatter):
+    """``colorlog.ColoredFormatter`` with duplicate-exception folding, used for the console."""
+
+    def __init__(self, *args, fold_window: float = 60.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fold_window = fold_window
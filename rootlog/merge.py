@@ -0,0 +1,139 @@
+import argparse
+import gzip
+import heapq
+import itertools
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+# "%(asctime)s" as rendered by logging.Formatter, e.g. "2024-03-15 14:02:11,123"
+_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[,.]\d+)?")
+# app.1234.log, app.1234.log.3 (RotatingFileHandler), app.1234.log.2024-03-15_14 (TimedRotatingFileHandler)
+_ROTATED = re.compile(r"^(?P<live>.+\.log)(?:\.(?:(?P<index>\d+)|(?P<date>\d{4}-\d{2}-\d{2}(?:_\d{2}(?:-\d{2}){0,2})?)))?$")
+# Continuation lines joined into one record at most; a longer run is split so memory stays bounded
+MAX_CONTINUATION_LINES = 1000
+
+
+def _open(path: Path):
+    opener = gzip.open if path.suffix == ".gz" else open
+    return opener(path, "rt", encoding="utf-8", errors="replace")
+
+
+def _has_timestamps(path: Path) -> bool:
+    """Whether the first line of a log file starts with a timestamp."""
+    try:
+        with _open(path) as f:
+            return bool(_TIMESTAMP.match(f.readline()))
+    except (OSError, EOFError):
+        return False
+
+
+def _shard_of(path: Path) -> Tuple[str, tuple]:
+    """Return (live file name, age order) for a log file, rotated and compressed files included."""
+    name = path.name[:-3] if path.name.endswith(".gz") else path.name
+    match = _ROTATED.match(name)
+    if not match:
+        return name, (2, 0, "")
+    if match.group("date"):
+        return match.group("live"), (0, 0, match.group("date"))
+    if match.group("index"):
+        # Higher backup numbers are older
+        return match.group("live"), (1, -int(match.group("index")), "")
+    return match.group("live"), (2, 0, "")
+
+
+def group_shards(paths: Iterable[Union[str, Path]]) -> Dict[str, List[Path]]:
+    """Group log files by shard, each shard's files ordered oldest first (live file last).
+
+    Files found in a directory are skipped if they do not start with a timestamp (e.g. a
+    format without ``%(asctime)s``); files passed explicitly are always included.
+    """
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(p for p in path.iterdir() if p.is_file() and ".log" in p.name and _has_timestamps(p))
+        else:
+            files.append(path)
+    shards: Dict[str, List[Tuple[tuple, Path]]] = {}
+    for path in files:
+        live, order = _shard_of(path)
+        shards.setdefault(str(path.parent / live), []).append((order, path))
+    return {shard: [path for _, path in sorted(entries)] for shard, entries in sorted(shards.items())}
+
+
+def read_records(path: Union[str, Path]) -> Iterator[Tuple[str, str]]:
+    """Yield (timestamp, text) per record of a log file, joining continuation lines like tracebacks.
+
+    Lines before the first timestamp are yielded one by one with an empty timestamp, and a run
+    of more than ``MAX_CONTINUATION_LINES`` lines without one is split, so a file without
+    timestamps is streamed instead of being read into a single record.
+    """
+    with _open(Path(path)) as f:
+        timestamp, lines = "", []
+        for line in f:
+            match = _TIMESTAMP.match(line)
+            if match:
+                if lines:
+                    yield timestamp, "".join(lines)
+                timestamp, lines = match.group(0).replace("T", " ").replace(".", ","), [line]
+            elif not timestamp:
+                yield timestamp, line
+            else:
+                if len(lines) > MAX_CONTINUATION_LINES:
+                    yield timestamp, "".join(lines)
+                    lines = []
+                lines.append(line)
+        if lines:
+            if not lines[-1].endswith("\n"):
+                lines[-1] += "\n"
+            yield timestamp, "".join(lines)
+
+
+def merge_logs(paths: Iterable[Union[str, Path]]) -> Iterator[str]:
+    """Stream the records of all shards in timestamp order.
+
+    Each shard's files are read oldest first and shards are combined with a k-way merge,
+    so memory stays constant regardless of the size of the files. Records with equal
+    timestamps keep their order within a shard.
+    """
+    streams = [itertools.chain.from_iterable(map(read_records, files)) for files in group_shards(paths).values()]
+    for _, text in heapq.merge(*streams, key=lambda record: record[0]):
+        yield text
+
+
+def _resolve(target: str) -> Path:
+    path = Path(target)
+    if path.exists():
+        return path
+    # Treat anything else as an app name under PY_LOG_PATH
+    return Path(os.getenv("PY_LOG_PATH", Path.home() / "python-log")) / target
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="rootlog-merge", description="Merge per-process rootlog shards into one time-ordered stream.")
+    parser.add_argument("targets", nargs="+", help="app names (under PY_LOG_PATH), log directories or log files")
+    parser.add_argument("-o", "--output", help="write to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    paths = [_resolve(target) for target in args.targets]
+    missing = [str(path) for path in paths if not path.exists()]
+    if missing:
+        parser.error(f"not found: {', '.join(missing)}")
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for text in merge_logs(paths):
+            out.write(text)
+    except BrokenPipeError:
+        # e.g. rootlog-merge myapp | head
+        pass
+    finally:
+        if args.output:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,361 @@
+import abc
+import datetime
+import errno
+import http.client
+import json
+import logging
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Union
+from urllib.parse import urlsplit
+
+from . import forksafe
+
+# RFC5424 severities for the standard logging levels
+SYSLOG_SEVERITY = {
+    logging.DEBUG: 7,
+    logging.INFO: 6,
+    logging.WARNING: 4,
+    logging.ERROR: 3,
+    logging.CRITICAL: 2,
+}
+
+
+def _record_to_dict(record: logging.LogRecord, formatter: Optional[logging.Formatter] = None) -> dict:
+    """Return the JSON-serialisable fields shipped for a record."""
+    data = {
+        "time": record.created,
+        "level": record.levelname,
+        "logger": record.name,
+        "message": record.getMessage(),
+        "filename": record.filename,
+        "lineno": record.lineno,
+        "funcName": record.funcName,
+        "process": record.process,
+        "thread": record.thread,
+    }
+    for name in getattr(record, "context_fields", ()):
+        # contextvars captured by rootlog_config(context_fields=...)
+        data[name] = getattr(record, name)
+    if record.exc_info:
+        data["exc_info"] = (formatter or logging.Formatter()).formatException(record.exc_info)
+    return data
+
+
+class BatchingNetworkHandler(logging.Handler, metaclass=abc.ABCMeta):
+    """Base class for network sinks: batches payloads and ships them from a background thread.
+
+    A batch is sent once ``batch_size`` payloads are pending or ``flush_interval`` seconds have
+    passed. Failed sends drop the connection, back off exponentially before reconnecting and
+    append the batch to a bounded spill file, which is replayed in order once the endpoint is
+    reachable again. Subclasses implement ``make_payload``, ``_connect`` and ``_send``; a
+    ``_send`` that ships payloads one at a time advances ``self._delivered``, so only the
+    payloads after a mid-batch failure are spilled and resent.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        spill_path: Optional[Union[str, Path]] = None,
+        spill_max_bytes: int = 10 * 1024**2,
+        retry_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        timeout: float = 5.0,
+    ):
+        super().__init__()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.spill_max_bytes = spill_max_bytes
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.dropped = 0
+        # Payloads of the batch being sent that already went out, for sinks sending one at a time
+        self._delivered = 0
+        self._batch = []
+        self._conn = None
+        self._backoff = retry_backoff
+        self._retry_at = 0.0
+        self._send_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closing = False
+        self._thread = None
+        self._start_flusher()
+        forksafe.register(self)
+
+    def _after_fork_in_child(self):
+        # Never share the parent's connection; its pending batch is the parent's to send
+        self._conn = None
+        self._batch = []
+        self._send_lock = threading.Lock()
+        self._wake = threading.Event()
+        if not self._closing:
+            self._start_flusher()
+
+    def _start_flusher(self):
+        self._thread = threading.Thread(target=self._run, name=f"rootlog-{self.__class__.__name__}", daemon=True)
+        self._thread.start()
+
+    @abc.abstractmethod
+    def make_payload(self, record: logging.LogRecord) -> str:
+        """Return the serialised payload for ``record``."""
+
+    @abc.abstractmethod
+    def _connect(self):
+        """Open and return a connection to the endpoint."""
+
+    @abc.abstractmethod
+    def _send(self, payloads: List[str]):
+        """Send a batch of payloads over ``self._conn``."""
+
+    def _disconnect(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except OSError:
+                pass
+            self._conn = None
+
+    def emit(self, record):
+        try:
+            payload = self.make_payload(record)
+        except Exception:
+            self.handleError(record)
+            return
+        # Handler.handle() already holds self.lock here
+        self._batch.append(payload)
+        if len(self._batch) >= self.batch_size:
+            self._wake.set()
+
+    def _run(self):
+        while not self._closing:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Send pending payloads now, spilling them to disk if the endpoint is down."""
+        self.acquire()
+        try:
+            batch, self._batch = self._batch, []
+        finally:
+            self.release()
+        with self._send_lock:
+            if time.monotonic() < self._retry_at:
+                self._spill(batch)
+                return
+            unsent = batch
+            try:
+                self._replay_spill()
+                if batch:
+                    self._ensure_connected()
+                    try:
+                        self._send_from_start(batch)
+                    finally:
+                        unsent = batch[self._delivered :]
+                self._backoff = self.retry_backoff
+            except (OSError, http.client.HTTPException):
+                self._disconnect()
+                self._retry_at = time.monotonic() + self._backoff
+                self._backoff = min(self._backoff * 2, self.max_backoff)
+                self._spill(unsent)
+
+    def _send_from_start(self, payloads: List[str]):
+        self._delivered = 0
+        self._send(payloads)
+        self._delivered = len(payloads)
+
+    def _ensure_connected(self):
+        if self._conn is None:
+            self._conn = self._connect()
+
+    def _spill(self, batch: List[str]):
+        if not batch:
+            return
+        if self.spill_path is None:
+            self.dropped += len(batch)
+            return
+        data = "".join(json.dumps(payload) + "\n" for payload in batch)
+        try:
+            size = self.spill_path.stat().st_size if self.spill_path.exists() else 0
+            if size + len(data) > self.spill_max_bytes:
+                self.dropped += len(batch)
+                return
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                f.write(data)
+        except OSError:
+            self.dropped += len(batch)
+
+    def _replay_spill(self):
+        if self.spill_path is None or not self.spill_path.exists():
+            return
+        with open(self.spill_path, encoding="utf-8") as f:
+            spilled = [json.loads(line) for line in f if line.strip()]
+        self._ensure_connected()
+        sent = 0
+        try:
+            while sent < len(spilled):
+                chunk = spilled[sent : sent + self.batch_size]
+                try:
+                    self._send_from_start(chunk)
+                finally:
+                    sent += self._delivered
+        finally:
+            remaining = spilled[sent:]
+            if remaining:
+                with open(self.spill_path, "w", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(payload) + "\n" for payload in remaining))
+            else:
+                self.spill_path.unlink()
+
+    def close(self):
+        self._closing = True
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(self.timeout)
+        self.flush()
+        self._disconnect()
+        super().close()
+
+
+class SyslogHandler(BatchingNetworkHandler):
+    """RFC5424 syslog over UDP (one datagram per message) or TCP (RFC6587 octet counting).
+
+    UDP messages are truncated to ``max_datagram`` bytes. One that still does not fit the path
+    (``EMSGSIZE``) is dropped and counted in ``dropped``, since resending it could never succeed.
+    """
+
+    def __init__(self, host: str, port: int = 514, protocol: str = "udp", app_name: str = "-", facility: int = 1, max_datagram: int = 65507, **kwargs):
+        if protocol not in ("udp", "tcp"):
+            raise ValueError(f"Unsupported syslog protocol: {protocol}")
+        self.address = (host, port)
+        self.protocol = protocol
+        self.app_name = app_name or "-"
+        self.facility = facility
+        # 65507 is the largest UDP payload over IPv4
+        self.max_datagram = max_datagram
+        self.hostname = socket.gethostname() or "-"
+        super().__init__(**kwargs)
+
+    def make_payload(self, record):
+        severity = SYSLOG_SEVERITY.get(record.levelno, 7 if record.levelno < logging.INFO else 3)
+        timestamp = datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec="microseconds").replace("+00:00", "Z")
+        payload = f"<{self.facility * 8 + severity}>1 {timestamp} {self.hostname} {self.app_name} {record.process} - - {self.format(record)}"
+        if self.protocol == "udp":
+            data = payload.encode("utf-8")
+            if len(data) > self.max_datagram:
+                # Cut on a character boundary; a long traceback loses its tail instead of the whole record
+                payload = data[: self.max_datagram].decode("utf-8", "ignore")
+        return payload
+
+    def _connect(self):
+        if self.protocol == "tcp":
+            return socket.create_connection(self.address, timeout=self.timeout)
+        family, socktype, proto, _, sockaddr = socket.getaddrinfo(*self.address, type=socket.SOCK_DGRAM)[0]
+        sock = socket.socket(family, socktype, proto)
+        sock.connect(sockaddr)
+        return sock
+
+    def _send(self, payloads):
+        if self.protocol == "tcp":
+            frames = []
+            for payload in payloads:
+                data = payload.encode("utf-8")
+                frames.append(b"%d %s" % (len(data), data))
+            self._conn.sendall(b"".join(frames))
+        else:
+            for payload in payloads:
+                try:
+                    self._conn.send(payload.encode("utf-8"))
+                except OSError as e:
+                    if e.errno != errno.EMSGSIZE:
+                        raise
+                    self.dropped += 1
+                self._delivered += 1
+
+
+class TCPJSONHandler(BatchingNetworkHandler):
+    """Newline-delimited JSON over a persistent raw TCP connection."""
+
+    def __init__(self, host: str, port: int, **kwargs):
+        self.address = (host, port)
+        super().__init__(**kwargs)
+
+    def make_payload(self, record):
+        return json.dumps(_record_to_dict(record, self.formatter), default=str)
+
+    def _connect(self):
+        return socket.create_connection(self.address, timeout=self.timeout)
+
+    def _send(self, payloads):
+        self._conn.sendall(("\n".join(payloads) + "\n").encode("utf-8"))
+
+
+class HTTPBatchHandler(BatchingNetworkHandler):
+    """POSTs each batch as a JSON array over a persistent keep-alive HTTP(S) connection."""
+
+    def __init__(self, url: str, headers: Optional[dict] = None, **kwargs):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported HTTP sink URL: {url}")
+        self.url = url
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        super().__init__(**kwargs)
+
+    def make_payload(self, record):
+        return json.dumps(_record_to_dict(record, self.formatter), default=str)
+
+    def _connect(self):
+        connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def _send(self, payloads):
+        body = ("[" + ",".join(payloads) + "]").encode("utf-8")
+        self._conn.request("POST", self.path, body=body, headers=self.headers)
+        response = self._conn.getresponse()
+        response.read()
+        if response.status >= 500 or response.status == 429:
+            raise OSError(f"HTTP sink returned {response.status}")
+        if response.status >= 400:
+            # The endpoint rejected the data itself, retrying would not help
+            self.dropped += len(payloads)
+
+
+def _parse_sink(sink: str) -> dict:
+    """Parse a sink URL like "syslog+udp://host:514", "tcp://host:5170" or "http://host/path"."""
+    parts = urlsplit(sink.strip())
+    scheme = parts.scheme.lower()
+    if scheme in ("syslog", "syslog+udp", "syslog+tcp"):
+        protocol = "tcp" if scheme == "syslog+tcp" else "udp"
+        return {"type": "syslog", "host": parts.hostname, "port": parts.port or 514, "protocol": protocol}
+    if scheme == "tcp":
+        if not parts.port:
+            raise ValueError(f"TCP sink needs a port: {sink}")
+        return {"type": "tcp", "host": parts.hostname, "port": parts.port}
+    if scheme in ("http", "https"):
+        return {"type": "http", "url": sink.strip()}
+    raise ValueError(f"Unsupported sink: {sink}")
+
+
+def create_sink_handler(sink: str, app_name: str = "-", spill_dir: Optional[Path] = None, **kwargs) -> BatchingNetworkHandler:
+    """Create a network sink handler from a sink URL (see ``_parse_sink``)."""
+    config = _parse_sink(sink)
+    if spill_dir is not None:
+        safe_name = "".join(c if c.isalnum() else "_" for c in sink)
+        kwargs.setdefault("spill_path", spill_dir / f"{safe_name}.spill")
+    if config["type"] == "syslog":
+        return SyslogHandler(config["host"], config["port"], protocol=config["protocol"], app_name=app_name, **kwargs)
+    elif config["type"] == "tcp":
+        return TCPJSONHandler(config["host"], config["port"], **kwargs)
+    else:
+        return HTTPBatchHandler(config["url"], **kwargs)
+
@@ -0,0 +1,99 @@
+import logging
+import queue
+import time
+from collections.abc import Mapping
+from logging.handlers import QueueHandler, QueueListener
+
+from . import forksafe
+from .records import CompactLogRecord
+
+# Argument types that can't change after the call, so the listener can render them later
+_IMMUTABLE_TYPES = frozenset((str, int, float, bool, bytes, complex, type(None)))
+# Mutable builtin containers: a shallow copy freezes what the caller passed
+_COPYABLE_TYPES = frozenset((list, dict, set, bytearray))
+
+
+def _snapshot_args(args):
+    """Return ``args`` safe to render on another thread, or None if they must be rendered now."""
+    # Any mapping (OrderedDict, defaultdict, MappingProxyType...) is copied into a new dict
+    is_mapping = isinstance(args, Mapping)
+    snapshot = []
+    copied = is_mapping
+    for arg in args.values() if is_mapping else args:
+        arg_type = type(arg)
+        if arg_type in _IMMUTABLE_TYPES:
+            snapshot.append(arg)
+        elif arg_type in _COPYABLE_TYPES:
+            snapshot.append(arg_type(arg))
+            copied = True
+        elif arg_type is tuple and all(type(item) in _IMMUTABLE_TYPES for item in arg):
+            snapshot.append(arg)
+        else:
+            # Arbitrary objects may change (or not be thread-safe to repr) before the listener runs
+            return None
+    if is_mapping:
+        return dict(zip(args.keys(), snapshot))
+    # Keep the caller's tuple when nothing needed copying
+    return tuple(snapshot) if copied else args
+
+
+def prepare_record(record: logging.LogRecord) -> logging.LogRecord:
+    """Snapshot the minimum of ``record`` needed to format it later on a listener thread.
+
+    Unlike ``QueueHandler.prepare`` this neither renders the message nor the traceback: the
+    msg template stays, args are shallow-copied when they are builtin containers and
+    ``exc_info`` is passed on by reference. Only non-string messages and args of other types
+    (whose ``__str__`` or ``__repr__`` may change before the listener gets to them) are
+    rendered eagerly.
+    """
+    if isinstance(record, CompactLogRecord):
+        # Resolve the lazy thread name while the producing thread is still alive
+        record.threadName
+    args = record.args
+    snapshot = _snapshot_args(args) if args else args
+    if snapshot is None or type(record.msg) is not str:
+        record.msg = record.getMessage()
+        record.args = None
+    elif snapshot is not args:
+        record.args = snapshot
+    return record
+
+
+class DeferredQueueHandler(QueueHandler):
+    """``QueueHandler`` that leaves message and traceback rendering to the listener thread."""
+
+    def prepare(self, record):
+        return prepare_record(record)
+
+
+class ForkSafeQueueListener(QueueListener):
+    """``QueueListener`` that restarts itself in forked children.
+
+    After ``fork()`` the child inherits the ``QueueHandler`` but not the listener thread, so
+    its records would pile up in the queue forever. The child gets a fresh queue (the inherited
+    one may hold records of the parent and a mutex locked by a parent thread) and its own
+    listener thread. The parent is untouched.
+    """
+
+    # Smoothed seconds spent handing one record to the sinks, tracked when track_latency is set
+    latency = 0.0
+    track_latency = False
+
+    def __init__(self, queue_handler: QueueHandler, *handlers, respect_handler_level: bool = False):
+        super().__init__(queue_handler.queue, *handlers, respect_handler_level=respect_handler_level)
+        self.queue_handler = queue_handler
+        forksafe.register(self)
+
+    def handle(self, record):
+        if not self.track_latency:
+            return super().handle(record)
+        start = time.perf_counter()
+        super().handle(record)
+        self.latency += (time.perf_counter() - start - self.latency) * 0.1
+
+    def _after_fork_in_child(self):
+        running = self._thread is not None
+        self.queue = self.queue_handler.queue = queue.Queue()
+        self._thread = None
+        if running:
+            self.start()
@@ -0,0 +1,228 @@
+import logging
+import os
+import sys
+import threading
+import time
+from collections.abc import Mapping, MutableMapping
+
+# Attributes computed on first access instead of in __init__
+_LAZY = ("filename", "module", "msecs", "relativeCreated", "threadName", "processName")
+_SLOTS = (
+    "name",
+    "msg",
+    "args",
+    "levelname",
+    "levelno",
+    "pathname",
+    "exc_info",
+    "exc_text",
+    "stack_info",
+    "lineno",
+    "funcName",
+    "created",
+    "thread",
+    "process",
+    "taskName",
+    # Set by Formatter.format
+    "message",
+    "asctime",
+) + _LAZY
+_SLOT_SET = frozenset(_SLOTS)
+_LAZY_SET = frozenset(_LAZY)
+# Python 3.12+ records carry the asyncio task name, which has to be read on the logging thread
+_HAS_TASK_NAME = hasattr(logging, "logAsyncioTasks")
+# The __dict__ descriptor LogRecord defines; gives the real instance dict for extra attributes
+_instance_dict = logging.LogRecord.__dict__["__dict__"].__get__
+_no_value = object()
+
+
+def _task_name():
+    if not logging.logAsyncioTasks:
+        return None
+    asyncio = sys.modules.get("asyncio")
+    if asyncio is None:
+        return None
+    try:
+        return asyncio.current_task().get_name()
+    except Exception:
+        return None
+
+
+class CompactLogRecord(logging.LogRecord):
+    """``LogRecord`` with a ``__slots__`` layout and lazily computed attributes.
+
+    The standard record stores ~20 attributes in an instance dict. Here the fields set on every
+    call live in slots, and ``filename``, ``module``, ``msecs``, ``relativeCreated``,
+    ``threadName`` (looked up from the thread ident) and ``processName`` are only computed
+    when a formatter or filter reads them. Attributes added through ``extra=`` or by filters
+    still go to an instance dict, created on first use.
+
+    ``record.__dict__`` is a ``MutableMapping`` view over slots, lazy attributes and extras,
+    so formatters (``self._fmt % record.__dict__``), ``makeLogRecord`` and JSON formatters
+    that iterate it keep working. Install it with ``logging.setLogRecordFactory`` or
+    ``rootlog_config(compact_records=True)``.
+    """
+
+    __slots__ = _SLOTS
+
+    def __init__(self, name, level, pathname, lineno, msg, args, exc_info, func=None, sinfo=None, **kwargs):
+        self.created = time.time()
+        self.name = name
+        self.msg = msg
+        # Same special case as LogRecord: a single mapping argument is used for %(key)s formatting
+        if args and len(args) == 1 and isinstance(args[0], Mapping) and args[0]:
+            args = args[0]
+        self.args = args
+        self.levelname = logging.getLevelName(level)
+        self.levelno = level
+        self.pathname = pathname
+        self.exc_info = exc_info
+        self.exc_text = None
+        self.stack_info = sinfo
+        self.lineno = lineno
+        self.funcName = func
+        self.thread = threading.get_ident() if logging.logThreads else None
+        self.process = os.getpid() if logging.logProcesses and hasattr(os, "getpid") else None
+        if _HAS_TASK_NAME:
+            self.taskName = _task_name()
+
+    def __getattr__(self, name):
+        # Only called for unset slots and unknown names
+        if name not in _LAZY_SET:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        if name in ("filename", "module"):
+            try:
+                self.filename = os.path.basename(self.pathname)
+                self.module = os.path.splitext(self.filename)[0]
+            except (TypeError, ValueError, AttributeError):
+                self.filename = self.pathname
+                self.module = "Unknown module"
+        elif name == "msecs":
+            self.msecs = int((self.created - int(self.created)) * 1000) + 0.0
+        elif name == "relativeCreated":
+            start = logging._startTime
+            if isinstance(start, int):
+                # Python 3.13+ keeps the start time in nanoseconds
+                start /= 1e9
+            self.relativeCreated = (self.created - start) * 1000
+        elif name == "threadName":
+            if self.thread is None:
+                self.threadName = None
+            else:
+                # threading._active maps idents of live threads to their Thread objects
+                thread = threading._active.get(self.thread)
+                self.threadName = thread.name if thread is not None else f"Thread-{self.thread}"
+        elif name == "processName":
+            self.processName = _process_name()
+        return object.__getattribute__(self, name)
+
+    @property
+    def __dict__(self):
+        return _RecordDict(self)
+
+    def __copy__(self):
+        new = object.__new__(type(self))
+        for name in _SLOTS:
+            value = _get_slot(self, name)
+            if value is not _no_value:
+                object.__setattr__(new, name, value)
+        extras = _instance_dict(self)
+        if extras:
+            _instance_dict(new).update(extras)
+        return new
+
+    def __reduce__(self):
+        # Pickle (multiprocessing queues, SocketHandler) as a plain mapping with every attribute computed
+        return logging.makeLogRecord, (dict(self.__dict__),)
+
+
+def _process_name():
+    if not logging.logMultiprocessing:
+        return None
+    mp = sys.modules.get("multiprocessing")
+    if mp is not None:
+        try:
+            return mp.current_process().name
+        except Exception:
+            pass
+    return "MainProcess"
+
+
+def _get_slot(record, name):
+    try:
+        return object.__getattribute__(record, name)
+    except AttributeError:
+        return _no_value
+
+
+class _RecordDict(MutableMapping):
+    """Mapping view of a ``CompactLogRecord``'s attributes, standing in for its ``__dict__``."""
+
+    __slots__ = ("_record",)
+
+    def __init__(self, record: CompactLogRecord):
+        self._record = record
+
+    def __getitem__(self, key):
+        record = self._record
+        if key in _SLOT_SET:
+            try:
+                return getattr(record, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if key in _CLASS_ATTRS:
+            raise KeyError(key)
+        # Reads the instance dict without materialising it
+        value = _get_slot(record, key)
+        if value is _no_value:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        if key in _LAZY_SET:
+            return True
+        if key in _SLOT_SET or key not in _CLASS_ATTRS:
+            return _get_slot(self._record, key) is not _no_value
+        return False
+
+    def __setitem__(self, key, value):
+        if key in _SLOT_SET:
+            object.__setattr__(self._record, key, value)
+        else:
+            _instance_dict(self._record)[key] = value
+
+    def __delitem__(self, key):
+        if key in _SLOT_SET:
+            try:
+                object.__delattr__(self._record, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        else:
+            del _instance_dict(self._record)[key]
+
+    def __iter__(self):
+        record = self._record
+        for name in _SLOTS:
+            if name in _LAZY_SET or _get_slot(record, name) is not _no_value:
+                yield name
+        yield from list(_instance_dict(record))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def copy(self):
+        # record.__dict__.copy() is a common way to snapshot a record; return a detached plain dict like the stdlib
+        return dict(self)
+
+    def __or__(self, other):
+        return {**self, **other}
+
+    def __ror__(self, other):
+        # Formatter(defaults=...) merges ``defaults | record.__dict__``
+        return {**other, **self}
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+_CLASS_ATTRS = frozenset(dir(CompactLogRecord))
@@ -0,0 +1,162 @@
+import logging
+import time
+from collections import deque
+
+from . import forksafe
+
+
+class ResilientFileHandler(logging.Handler):
+    """File sink that survives a degraded disk instead of failing every ``emit``.
+
+    Wraps a ``FileHandler`` (usually the rotating handler built by ``_create_file_handler``)
+    and writes through its stream itself. When a write raises ``OSError`` (ENOSPC, EIO, stale
+    NFS handle...) or takes longer than ``slow_write`` seconds, the handler goes degraded:
+    records are kept in a bounded in-memory spill (oldest dropped first once full) and the disk
+    is retried with exponential backoff. On recovery the spill is replayed in order followed by a
+    single summary record about the outage and anything that was dropped.
+    """
+
+    def __init__(
+        self,
+        target: logging.FileHandler,
+        spill_capacity: int = 10000,
+        slow_write: float = 1.0,
+        retry_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ):
+        super().__init__()
+        self.target = target
+        self.slow_write = slow_write
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self.spill = deque(maxlen=spill_capacity)
+        self.dropped = 0
+        self.degraded_since = None
+        self._backoff = retry_backoff
+        self._retry_at = 0.0
+        self._last_error = None
+        forksafe.register(self)
+
+    def _after_fork_in_child(self):
+        # Spilled records are the parent's; the child starts with a clean slate
+        self.spill.clear()
+        self.dropped = 0
+        self.degraded_since = None
+        self._backoff = self.retry_backoff
+        self._retry_at = 0.0
+        self._last_error = None
+
+    @property
+    def baseFilename(self) -> str:
+        return self.target.baseFilename
+
+    def emit(self, record):
+        try:
+            msg = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        if self.degraded_since is not None:
+            if time.monotonic() < self._retry_at:
+                self._spill(record, msg)
+                return
+            try:
+                self._recover()
+            except OSError as e:
+                self._enter_degraded(e)
+                self._spill(record, msg)
+                return
+        try:
+            self._write(record, msg)
+        except OSError as e:
+            self._enter_degraded(e)
+            self._spill(record, msg)
+
+    def _write(self, record, msg):
+        target = self.target
+        start = time.perf_counter()
+        if hasattr(target, "shouldRollover") and target.shouldRollover(record):
+            target.doRollover()
+        if target.stream is None:
+            target.stream = target._open()
+        target.stream.write(msg + target.terminator)
+        target.stream.flush()
+        elapsed = time.perf_counter() - start
+        if elapsed > self.slow_write:
+            # The record made it, but stop blocking callers on a stalled disk
+            self._enter_degraded(f"slow write ({elapsed:.1f}s)")
+
+    def _spill(self, record, msg):
+        if len(self.spill) == self.spill.maxlen:
+            self.dropped += 1
+        self.spill.append((record, msg))
+
+    def _enter_degraded(self, reason):
+        if self.degraded_since is None:
+            self.degraded_since = time.time()
+        else:
+            self._backoff = min(self._backoff * 2, self.max_backoff)
+        self._last_error = reason
+        self._retry_at = time.monotonic() + self._backoff
+        if isinstance(reason, OSError):
+            self._reset_stream()
+
+    def _reset_stream(self):
+        stream, self.target.stream = self.target.stream, None
+        if stream is not None:
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+    def _recover(self):
+        """Replay the spill in order; raises ``OSError`` if the disk is still failing."""
+        while self.spill:
+            record, msg = self.spill[0]
+            self._write(record, msg)
+            self.spill.popleft()
+        if self.degraded_since is None:
+            return
+        outage = time.time() - self.degraded_since
+        summary = logging.makeLogRecord(
+            {
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": "File logging degraded for %.1fs (%s); %d record(s) dropped from the spill buffer",
+                "args": (outage, self._last_error, self.dropped),
+            }
+        )
+        # Let filters fill in fields the file format expects (e.g. context fields)
+        self.filter(summary)
+        self._write(summary, self.format(summary))
+        self.degraded_since = None
+        self.dropped = 0
+        self._backoff = self.retry_backoff
+        self._last_error = None
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.degraded_since is None and self.target.stream is not None:
+                self.target.stream.flush()
+        except OSError as e:
+            self._enter_degraded(e)
+        finally:
+            self.release()
+
+    def close(self):
+        self.acquire()
+        try:
+            if self.degraded_since is not None:
+                try:
+                    self._recover()
+                except OSError:
+                    pass
+            try:
+                self.target.close()
+            except OSError:
+                pass
+        finally:
+            self.release()
+        super().close()
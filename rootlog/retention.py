@@ -0,0 +1,148 @@
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+def _parse_size(size: Union[str, int]) -> int:
+    """Parse a byte budget like 1048576, "500 MB" or "1.5 GB"."""
+    if isinstance(size, int):
+        return size
+    match = re.match(r"(\d+(?:\.\d+)?)\s*(gb|mb|kb|b)$", size.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid size: {size}")
+    value, unit = match.groups()
+    multipliers = {"b": 1, "kb": 1024, "mb": 1024**2, "gb": 1024**3}
+    return int(float(value) * multipliers[unit])
+
+
+def _parse_age(age: Union[str, int, float]) -> float:
+    """Parse a maximum age like 3600 (seconds), "12 hours", "7 days" or "2 weeks"."""
+    if isinstance(age, (int, float)):
+        return float(age)
+    match = re.match(r"(\d+(?:\.\d+)?)\s*(second|minute|hour|day|week)s?$", age.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid age: {age}")
+    value, unit = match.groups()
+    seconds = {"second": 1, "minute": 60, "hour": 3600, "day": 86400, "week": 604800}
+    return float(value) * seconds[unit]
+
+
+def _is_rotated(name: str) -> bool:
+    """Return True for rotated backups (``.log.1``, ``.log.2024-01-01``, ``.log.1.gz``).
+
+    Live ``*.log`` files are never rotated backups, whatever hour their name carries: a process
+    keeps writing to the file named after its startup hour for its whole lifetime, so the
+    current file of a sibling process or another app can look old. Those are left to ``max_age``.
+    """
+    return not name.endswith(".log")
+
+
+class RetentionJanitor:
+    """Background thread enforcing a total byte budget and a maximum age on a log directory.
+
+    Every ``interval`` seconds the directory tree is scanned in batches of ``batch_size`` entries
+    with a short pause in between, so huge directories don't cause I/O spikes. Log files are then
+    deleted oldest-first until they are within ``max_bytes`` and none is older than ``max_age``.
+    The byte budget only removes rotated backups, while ``max_age`` applies to every log file. Files modified within the last ``grace`` seconds and
+    files in ``protect`` (the handlers' current files) are never deleted.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        max_bytes: Optional[Union[str, int]] = None,
+        max_age: Optional[Union[str, int, float]] = None,
+        interval: float = 300.0,
+        batch_size: int = 500,
+        batch_pause: float = 0.01,
+        grace: float = 60.0,
+        protect: Iterable[Union[str, Path]] = (),
+    ):
+        self.root = Path(root)
+        self.max_bytes = _parse_size(max_bytes) if max_bytes is not None else None
+        self.max_age = _parse_age(max_age) if max_age is not None else None
+        self.interval = interval
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.grace = grace
+        self.protect = {os.path.abspath(p) for p in protect}
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._monitor, name="rootlog-retention", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+    def _monitor(self):
+        while not self._stop_event.is_set():
+            try:
+                self.run_once()
+            except OSError as e:
+                logger.warning(f"Retention scan of {self.root} failed: {e}")
+            self._stop_event.wait(self.interval)
+
+    def _scan(self) -> Iterator[Tuple[float, int, str]]:
+        """Yield (mtime, size, path) for every log file below root, pausing between batches."""
+        pending = [str(self.root)]
+        seen = 0
+        while pending:
+            try:
+                entries = os.scandir(pending.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    seen += 1
+                    if seen % self.batch_size == 0 and self._stop_event.wait(self.batch_pause):
+                        return
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False) and ".log" in entry.name:
+                            stat = entry.stat(follow_symlinks=False)
+                            yield stat.st_mtime, stat.st_size, entry.path
+                    except OSError:
+                        continue
+
+    def run_once(self) -> int:
+        """Run one retention pass and return the number of deleted files."""
+        if self.max_bytes is None and self.max_age is None:
+            return 0
+        files = sorted(self._scan())
+        total = sum(size for _, size, _ in files)
+        now = time.time()
+        deleted = 0
+        for mtime, size, path in files:
+            expired = self.max_age is not None and now - mtime > self.max_age
+            over_budget = self.max_bytes is not None and total > self.max_bytes
+            if not (expired or over_budget):
+                # Files are sorted oldest-first, so nothing newer can qualify either
+                break
+            if now - mtime < self.grace or os.path.abspath(path) in self.protect:
+                continue
+            if not expired and not _is_rotated(os.path.basename(path)):
+                # Possibly another process's live file: deleting it would leave that process writing to an unlinked inode
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            deleted += 1
+            if deleted % self.batch_size == 0 and self._stop_event.wait(self.batch_pause):
+                break
+        if deleted:
+            logger.debug(f"Retention removed {deleted} file(s) from {self.root}")
+        return deleted
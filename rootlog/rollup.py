@@ -0,0 +1,158 @@
+import logging
+import os
+import threading
+import time
+from typing import Optional, Sequence
+
+from . import forksafe
+
+
+class RollupFilter(logging.Filter):
+    """Replace selected high-volume records with one summary record per window.
+
+    Installed on the handlers attached to the logger, so it runs on the producer before a
+    record is formatted or queued. A record is rolled up if its logger is one of ``loggers``
+    (or a child of one) and/or its level is at most ``level``; it is counted per logger,
+    level, message template and call site, then dropped. With ``stats`` the numeric args of
+    each template also get a running min/max/mean per position.
+
+    Every ``window`` seconds a background thread writes the counts as a single multi-line
+    INFO record from the ``rootlog.rollup`` logger to ``sink`` (the file handler). At most
+    ``max_keys`` distinct templates are tracked per window; further ones are only counted.
+    """
+
+    def __init__(
+        self,
+        sink: logging.Handler,
+        loggers: Optional[Sequence[str]] = None,
+        level: Optional[int] = None,
+        window: float = 60.0,
+        stats: bool = False,
+        max_keys: int = 10000,
+    ):
+        if loggers is None and level is None:
+            raise ValueError("Rollup needs loggers and/or a level to select records")
+        super().__init__()
+        self.sink = sink
+        self.loggers = tuple(loggers) if loggers is not None else None
+        self._prefixes = tuple(f"{name}." for name in self.loggers or ())
+        self.level = level
+        self.window = window
+        self.stats = stats
+        self.max_keys = max_keys
+        self._init_state()
+        self._stop_event = threading.Event()
+        self._thread = None
+        forksafe.register(self)
+
+    def _init_state(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._overflow = 0
+        self._window_start = time.time()
+
+    def _after_fork_in_child(self):
+        # The parent reports its own counts; the child starts a fresh window and flusher
+        self._init_state()
+        if self._thread is not None:
+            self._thread = None
+            self.start()
+
+    def selects(self, record) -> bool:
+        if self.level is not None and record.levelno > self.level:
+            return False
+        if self.loggers is not None:
+            name = record.name
+            return name in self.loggers or name.startswith(self._prefixes)
+        return True
+
+    def filter(self, record):
+        attrs = record.__dict__
+        if "rolled_up" in attrs:
+            # Already counted by another handler's copy of this filter
+            return False
+        if "rollup" in attrs or not self.selects(record):
+            return True
+        attrs["rolled_up"] = True
+        msg = record.msg if type(record.msg) is str else str(record.msg)
+        key = (record.name, record.levelno, msg, record.pathname, record.lineno)
+        with self._lock:
+            entry = self._counts.get(key)
+            if entry is None:
+                if len(self._counts) >= self.max_keys:
+                    self._overflow += 1
+                    return False
+                entry = self._counts[key] = [0, {}]
+            entry[0] += 1
+            if self.stats and isinstance(record.args, tuple):
+                self._update_stats(entry[1], record.args)
+        return False
+
+    @staticmethod
+    def _update_stats(stats: dict, args: tuple):
+        for position, value in enumerate(args):
+            if type(value) in (int, float):
+                current = stats.get(position)
+                if current is None:
+                    stats[position] = [value, value, value, 1]
+                else:
+                    if value < current[0]:
+                        current[0] = value
+                    if value > current[1]:
+                        current[1] = value
+                    current[2] += value
+                    current[3] += 1
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="rootlog-rollup", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop_event.wait(self.window):
+            self.flush()
+
+    def flush(self):
+        """Write the summary of the current window (if anything was rolled up) and start a new one."""
+        with self._lock:
+            counts, overflow, start = self._counts, self._overflow, self._window_start
+            self._counts, self._overflow, self._window_start = {}, 0, time.time()
+        if not counts and not overflow:
+            return
+        summary = logging.makeLogRecord(
+            {
+                "name": "rootlog.rollup",
+                "levelno": logging.INFO,
+                "levelname": "INFO",
+                "pathname": __file__,
+                "filename": os.path.basename(__file__),
+                "module": "rollup",
+                "funcName": "flush",
+                "msg": self.render(counts, overflow, time.time() - start),
+                "rollup": True,
+            }
+        )
+        try:
+            self.sink.handle(summary)
+        except Exception:
+            self.sink.handleError(summary)
+
+    @staticmethod
+    def render(counts: dict, overflow: int, elapsed: float) -> str:
+        total = sum(entry[0] for entry in counts.values()) + overflow
+        lines = [f"Rollup: {total} records from {len(counts)} call sites in the last {elapsed:.0f}s"]
+        for (name, levelno, msg, pathname, lineno), (count, stats) in sorted(counts.items(), key=lambda item: -item[1][0]):
+            line = f"  {count:>8}x {logging.getLevelName(levelno)} {name} {os.path.basename(pathname)}:{lineno} {msg!r}"
+            for position, (low, high, total_value, n) in sorted(stats.items()):
+                line += f" arg{position}[min={low:g} max={high:g} mean={total_value / n:g}]"
+            lines.append(line)
+        if overflow:
+            lines.append(f"  {overflow:>8}x from further call sites (max_keys reached)")
+        return "\n".join(lines)
@@ -0,0 +1,275 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .config import rootlog_config
+
+DEFAULT_LEVELS = "DEBUG=60,INFO=30,WARNING=8,ERROR=2"
+
+
+def _parse_levels(spec: str) -> Dict[int, float]:
+    """Parse a level mix like "DEBUG=60,INFO=30,ERROR=10" into {level: weight}."""
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        level = logging.getLevelName(name.strip().upper())
+        if not isinstance(level, int):
+            raise ValueError(f"Unknown level: {name}")
+        mix[level] = float(weight or 1)
+    return mix
+
+
+def _percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def _fail(depth: int):
+    # A few frames deep, like a real call stack
+    if depth:
+        _fail(depth - 1)
+    raise RuntimeError("simulated failure")
+
+
+def _producer(logger: logging.Logger, options: dict, thread_id: int, deadline: float, latencies: array, seed: int):
+    rng = random.Random(seed)
+    levels = list(options["levels"])
+    weights = list(options["levels"].values())
+    interval = 1.0 / options["rate_per_thread"] if options["rate_per_thread"] else 0.0
+    # Pre-build payloads so generating them is not measured
+    payloads = ["x" * max(1, int(rng.lognormvariate(0, 0.5) * options["size"])) for _ in range(64)]
+    try:
+        _fail(3)
+    except RuntimeError:
+        exc_info = sys.exc_info()
+    next_at = time.perf_counter()
+    i = 0
+    clock = time.perf_counter_ns
+    while True:
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+        if interval:
+            if now < next_at:
+                time.sleep(next_at - now)
+            next_at += interval
+        level = rng.choices(levels, weights)[0]
+        with_exc = level >= logging.ERROR and rng.random() < options["exc_ratio"]
+        payload = payloads[i % len(payloads)]
+        start = clock()
+        logger.log(level, "thread %d request %d user=%s payload=%s", thread_id, i, "user-42", payload, exc_info=exc_info if with_exc else None)
+        latencies.append(clock() - start)
+        i += 1
+
+
+def _run_process(options: dict, process_id: int, results=None) -> dict:
+    """Configure rootlog, run the producer threads and return the raw measurements."""
+    # rootlog_config reads the log directory from the environment; put the caller's value back afterwards
+    previous = os.environ.get("PY_LOG_PATH")
+    os.environ["PY_LOG_PATH"] = options["log_path"]
+    try:
+        return _measure(options, process_id, results)
+    finally:
+        if previous is None:
+            os.environ.pop("PY_LOG_PATH", None)
+        else:
+            os.environ["PY_LOG_PATH"] = previous
+
+
+def _measure(options: dict, process_id: int, results) -> dict:
+    config = dict(options["config"])
+    config.setdefault("app", options["app"])
+    config.setdefault("log_c", False)
+    rootlog_config(**config)
+    logger = logging.getLogger(config.get("logger_name"))
+
+    listeners = getattr(logger, "_queue_listeners", [])
+    log_queue = getattr(listeners[-1], "queue", None) if listeners else None
+    depth_samples: List[tuple] = []
+    stop_sampling = threading.Event()
+
+    def sample_depth():
+        while not stop_sampling.wait(options["sample_interval"]):
+            depth_samples.append((time.perf_counter() - started, log_queue.qsize()))
+
+    latencies = [array("q") for _ in range(options["threads"])]
+    started = time.perf_counter()
+    deadline = started + options["duration"]
+    threads = [threading.Thread(target=_producer, args=(logger, options, i, deadline, latencies[i], options["seed"] + process_id * 1000 + i)) for i in range(options["threads"])]
+    sampler = threading.Thread(target=sample_depth, daemon=True) if log_queue is not None else None
+    for t in threads:
+        t.start()
+    if sampler:
+        sampler.start()
+    for t in threads:
+        t.join()
+    produced = time.perf_counter() - started
+    if sampler:
+        stop_sampling.set()
+        sampler.join()
+
+    # Drain queue/buffer writers so the bytes on disk are complete
+    for listener in listeners:
+        listener.stop()
+    # Stopped listeners can't be stopped again by a later run on the same logger
+    listeners.clear()
+    for worker in getattr(logger, "_workers", []):
+        worker.stop()
+    for handler in logger.handlers[:]:
+        handler.close()
+        logger.removeHandler(handler)
+    drained = time.perf_counter() - started
+
+    merged = array("q")
+    for thread_latencies in latencies:
+        merged.extend(thread_latencies)
+    result = {"latencies": merged.tobytes(), "produced": produced, "drained": drained, "depth": depth_samples}
+    if results is not None:
+        results.put(result)
+    return result
+
+
+def _disk_usage(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def run_stress(options: dict) -> dict:
+    """Run a stress test and return the report as a dict."""
+    if options["processes"] > 1:
+        method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        context = multiprocessing.get_context(method)
+        results = context.Queue()
+        processes = [context.Process(target=_run_process, args=(options, i, results)) for i in range(options["processes"])]
+        for p in processes:
+            p.start()
+        raw = []
+        while len(raw) < len(processes):
+            try:
+                raw.append(results.get(timeout=0.5))
+            except queue.Empty:
+                failed = [p.exitcode for p in processes if p.exitcode]
+                if failed:
+                    raise RuntimeError(f"stress worker exited with code {failed[0]}")
+        for p in processes:
+            p.join()
+    else:
+        raw = [_run_process(options, 0)]
+
+    latencies = array("q")
+    for result in raw:
+        latencies.frombytes(result["latencies"])
+    ordered = sorted(latencies)
+    records = len(ordered)
+    produced = max(result["produced"] for result in raw)
+    drained = max(result["drained"] for result in raw)
+    depths = [depth for result in raw for _, depth in result["depth"]]
+    return {
+        "records": records,
+        "duration_s": round(produced, 3),
+        "throughput_rps": round(records / produced, 1) if produced else 0.0,
+        "end_to_end_rps": round(records / drained, 1) if drained else 0.0,
+        "latency_us": {
+            "p50": round(_percentile(ordered, 0.50) / 1000, 2),
+            "p99": round(_percentile(ordered, 0.99) / 1000, 2),
+            "p999": round(_percentile(ordered, 0.999) / 1000, 2),
+            "max": round((ordered[-1] if ordered else 0) / 1000, 2),
+        },
+        "queue_depth": {
+            "max": max(depths, default=0),
+            "mean": round(sum(depths) / len(depths), 1) if depths else 0.0,
+            # One series per process: [seconds since start, depth]
+            "samples": [[[round(t, 2), d] for t, d in result["depth"]] for result in raw],
+        },
+        "bytes_on_disk": _disk_usage(options["log_path"]),
+    }
+
+
+def _print_report(report: dict, options: dict):
+    latency = report["latency_us"]
+    depth = report["queue_depth"]
+    print(f"config:         {json.dumps(options['config'])}")
+    print(f"workers:        {options['processes']} process(es) x {options['threads']} thread(s), target {options['rate'] or 'max'} records/s")
+    print(f"records:        {report['records']:,} in {report['duration_s']}s")
+    print(f"throughput:     {report['throughput_rps']:,.0f} records/s (caller side), {report['end_to_end_rps']:,.0f} records/s (until drained)")
+    print(f"latency (us):   p50 {latency['p50']}  p99 {latency['p99']}  p999 {latency['p999']}  max {latency['max']}")
+    if depth["samples"] and any(depth["samples"]):
+        print(f"queue depth:    max {depth['max']:,}  mean {depth['mean']:,}")
+    print(f"bytes on disk:  {report['bytes_on_disk']:,} ({options['log_path']})")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="rootlog-stress", description="Generate production-like logging load against a rootlog configuration.")
+    parser.add_argument("--config", default="{}", help='rootlog_config keyword arguments as JSON, e.g. \'{"use_queue": true, "rotation": "10 MB"}\'')
+    parser.add_argument("--threads", type=int, default=4, help="producer threads per process (default: 4)")
+    parser.add_argument("--processes", type=int, default=1, help="producer processes (default: 1)")
+    parser.add_argument("--rate", type=float, default=0, help="target records/s across all producers, 0 for as fast as possible (default: 0)")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds to generate load (default: 5)")
+    parser.add_argument("--size", type=int, default=120, help="mean payload size in bytes (default: 120)")
+    parser.add_argument("--levels", default=DEFAULT_LEVELS, help=f"level mix (default: {DEFAULT_LEVELS})")
+    parser.add_argument("--exc-ratio", type=float, default=0.5, help="fraction of ERROR+ records carrying a traceback (default: 0.5)")
+    parser.add_argument("--app", default="stress", help="app name for the log directory (default: stress)")
+    parser.add_argument("--log-path", help="PY_LOG_PATH to write to (default: a temporary directory, removed afterwards)")
+    parser.add_argument("--sample-interval", type=float, default=0.1, help="seconds between queue depth samples (default: 0.1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        config = json.loads(args.config)
+        levels = _parse_levels(args.levels)
+    except ValueError as e:
+        parser.error(str(e))
+
+    temporary = args.log_path is None
+    log_path = tempfile.mkdtemp(prefix="rootlog-stress-") if temporary else args.log_path
+    workers = args.threads * args.processes
+    options = {
+        "config": config,
+        "threads": args.threads,
+        "processes": args.processes,
+        "rate": args.rate,
+        "rate_per_thread": args.rate / workers if args.rate else 0.0,
+        "duration": args.duration,
+        "size": args.size,
+        "levels": levels,
+        "exc_ratio": args.exc_ratio,
+        "app": args.app,
+        "log_path": str(Path(log_path)),
+        "sample_interval": args.sample_interval,
+        "seed": args.seed,
+    }
+    try:
+        report = run_stress(options)
+    finally:
+        if temporary:
+            shutil.rmtree(log_path, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report, options)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+import argparse
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .merge import _resolve
+
+# Level names as written by the default rootlog formats, searched near the start of a line
+_LEVEL = re.compile(rb"\b(DEBUG|INFO|WARNING|ERROR|CRITICAL)\b")
+_LEVEL_WINDOW = 64
+
+
+class _TailedFile:
+    """One followed file, tracked by inode so renames (rotation) and truncation are noticed."""
+
+    def __init__(self, path: Path, from_start: bool):
+        self.path = path
+        self.partial = b""
+        self._open(from_start)
+        self.last_read = time.monotonic()
+
+    def _open(self, from_start: bool):
+        self.file = open(self.path, "rb")
+        st = os.fstat(self.file.fileno())
+        self.inode = (st.st_dev, st.st_ino)
+        if not from_start:
+            self.file.seek(0, os.SEEK_END)
+
+    def read_lines(self, chunk_size: int, max_chunks: int) -> List[bytes]:
+        """Read complete lines in large chunks; a trailing partial line is kept for next time."""
+        lines: List[bytes] = []
+        for _ in range(max_chunks):
+            data = self.file.read(chunk_size)
+            if not data:
+                break
+            *complete, self.partial = (self.partial + data).split(b"\n")
+            lines.extend(complete)
+            if len(data) < chunk_size:
+                break
+        if lines:
+            self.last_read = time.monotonic()
+        return lines
+
+    def replaced(self) -> bool:
+        """Return True if the path now points to a new file (rotation). Handles truncation in place."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            # Rotated away and not recreated yet
+            return False
+        if (st.st_dev, st.st_ino) != self.inode:
+            return True
+        if st.st_size < self.file.tell():
+            self.file.seek(0)
+            self.partial = b""
+        return False
+
+    def reopen(self):
+        self.file.close()
+        self.partial = b""
+        self._open(from_start=True)
+
+    def close(self):
+        self.file.close()
+
+
+class AppFollower:
+    """Follow the live ``*.log`` files of one app directory across rotations and new files.
+
+    At start the newest live file (and any other live file written within ``concurrent``
+    seconds of it, e.g. per-process shards) is followed from its end. Files created later
+    (the next hourly ``YYYYMMDD-HH.log``, new shards) are picked up from their start when the
+    directory is rescanned, which only happens while the followed files are idle.
+
+    A rescan also stops following files that were deleted (once drained) and files idle for
+    more than ``concurrent`` seconds while a newer file is followed, e.g. past hours' logs. An
+    idle file that is written to again is resumed where it was left.
+    """
+
+    def __init__(self, log_dir: Union[str, Path], from_start: bool = False, chunk_size: int = 1 << 16, max_chunks: int = 64, rescan_interval: float = 1.0, concurrent: float = 300.0):
+        self.log_dir = Path(log_dir)
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.rescan_interval = rescan_interval
+        self.concurrent = concurrent
+        self.files: Dict[Path, _TailedFile] = {}
+        self._known = set()
+        # Files no longer followed because they went idle: path -> (mtime, inode, offset)
+        self._idle: Dict[Path, Tuple[float, tuple, int]] = {}
+        self._last_scan = 0.0
+        live = self._live_files()
+        if live:
+            newest = max(mtime for mtime, _ in live)
+            for mtime, path in live:
+                if newest - mtime <= concurrent:
+                    self.files[path] = _TailedFile(path, from_start)
+                else:
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    self._idle[path] = (mtime, (st.st_dev, st.st_ino), 0 if from_start else st.st_size)
+        self._known = {path for _, path in live}
+        self._last_scan = time.monotonic()
+
+    def _live_files(self) -> List[Tuple[float, Path]]:
+        live = []
+        try:
+            with os.scandir(self.log_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".log") and entry.is_file():
+                        live.append((entry.stat().st_mtime, Path(entry.path)))
+        except FileNotFoundError:
+            pass
+        return live
+
+    def _rescan(self):
+        # Only called after a poll that read nothing, so every followed file is drained
+        now = self._last_scan = time.monotonic()
+        mtimes = {path: mtime for mtime, path in self._live_files()}
+        newest = max(mtimes.values(), default=0.0)
+        for path, tailed in list(self.files.items()):
+            if path not in mtimes:
+                # Deleted (or rotated away and not recreated): a file created there later is new
+                self._known.discard(path)
+                del self.files[path]
+                tailed.close()
+            elif now - tailed.last_read > self.concurrent and mtimes[path] < newest:
+                self._idle[path] = (mtimes[path], tailed.inode, tailed.file.tell())
+                del self.files[path]
+                tailed.close()
+        for path, mtime in mtimes.items():
+            if path in self.files:
+                continue
+            idle = self._idle.get(path)
+            if idle is not None:
+                if mtime <= idle[0]:
+                    continue
+                del self._idle[path]
+            elif path in self._known:
+                continue
+            self._known.add(path)
+            try:
+                tailed = self.files[path] = _TailedFile(path, from_start=True)
+            except FileNotFoundError:
+                continue
+            if idle is not None and tailed.inode == idle[1]:
+                tailed.file.seek(idle[2])
+
+    def poll(self) -> List[bytes]:
+        """Return the complete lines written since the last poll."""
+        lines: List[bytes] = []
+        for tailed in list(self.files.values()):
+            lines.extend(tailed.read_lines(self.chunk_size, self.max_chunks))
+            if tailed.replaced():
+                # Drain what was written before the rename, then continue with the new file
+                lines.extend(tailed.read_lines(self.chunk_size, self.max_chunks))
+                tailed.reopen()
+                lines.extend(tailed.read_lines(self.chunk_size, self.max_chunks))
+        if not lines and time.monotonic() - self._last_scan >= self.rescan_interval:
+            self._rescan()
+        return lines
+
+    def close(self):
+        for tailed in self.files.values():
+            tailed.close()
+        self.files.clear()
+        self._idle.clear()
+
+
+class LineFilter:
+    """Filter lines by minimum level and regex; continuation lines (tracebacks) follow their record."""
+
+    def __init__(self, level: Optional[int] = None, pattern: Optional[str] = None):
+        self.level = level
+        self.pattern = re.compile(pattern) if pattern else None
+        self._keep = True
+
+    def __call__(self, line: bytes) -> bool:
+        match = _LEVEL.search(line, 0, _LEVEL_WINDOW)
+        if match:
+            # A new record starts here
+            keep = self.level is None or logging.getLevelName(match.group(1).decode()) >= self.level
+            if keep and self.pattern is not None:
+                keep = self.pattern.search(line.decode("utf-8", "replace")) is not None
+            self._keep = keep
+        return self._keep
+
+
+def follow(
+    targets: Iterable[Union[str, Path]],
+    level: Optional[int] = None,
+    pattern: Optional[str] = None,
+    from_start: bool = False,
+    min_interval: float = 0.05,
+    max_interval: float = 1.0,
+    stop: Optional[threading.Event] = None,
+) -> Iterator[Tuple[str, str]]:
+    """Yield (app, line) for new lines of one or more apps until ``stop`` is set.
+
+    Targets are app names under PY_LOG_PATH or log directories. Polling is adaptive: the
+    interval doubles from ``min_interval`` up to ``max_interval`` while nothing is written
+    and drops back as soon as new lines arrive.
+    """
+    stop = stop or threading.Event()
+    followers = [(Path(target).name, AppFollower(_resolve(str(target)), from_start=from_start), LineFilter(level, pattern)) for target in targets]
+    interval = min_interval
+    try:
+        while not stop.is_set():
+            got_lines = False
+            for name, follower, line_filter in followers:
+                for line in follower.poll():
+                    got_lines = True
+                    if line_filter(line):
+                        yield name, line.decode("utf-8", "replace")
+            interval = min_interval if got_lines else min(interval * 2, max_interval)
+            stop.wait(interval)
+    finally:
+        for _, follower, _ in followers:
+            follower.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="rootlog-tail", description="Follow rootlog app logs across rotations and new files.")
+    parser.add_argument("targets", nargs="+", help="app names (under PY_LOG_PATH) or log directories")
+    parser.add_argument("-l", "--level", help="minimum level to show, e.g. WARNING")
+    parser.add_argument("-g", "--grep", help="only show records matching this regex")
+    parser.add_argument("--from-start", action="store_true", help="print existing content of the current files first")
+    args = parser.parse_args(argv)
+
+    level = None
+    if args.level:
+        level = logging.getLevelName(args.level.upper())
+        if not isinstance(level, int):
+            parser.error(f"unknown level: {args.level}")
+
+    prefix = len(args.targets) > 1
+    try:
+        for name, line in follow(args.targets, level=level, pattern=args.grep, from_start=args.from_start):
+            sys.stdout.write(f"[{name}] {line}\n" if prefix else f"{line}\n")
+            sys.stdout.flush()
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
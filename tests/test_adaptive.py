@@ -0,0 +1,153 @@
+"""Tests for load-adaptive level throttling."""
+
+import logging
+import queue
+
+from rootlog import rootlog_config
+from rootlog.adaptive import AdaptiveLevelController
+
+
+class _Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def _controller(**kwargs):
+    logger = logging.getLogger("adaptive_test")
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    capture = _Capture()
+    logger.addHandler(capture)
+    log_queue = queue.Queue()
+    kwargs.setdefault("high_watermark", 3)
+    kwargs.setdefault("low_watermark", 1)
+    kwargs.setdefault("cooldown", 0)
+    return AdaptiveLevelController(logger, log_queue, **kwargs), logger, log_queue, capture
+
+
+class TestAdaptiveLevelController:
+    """Test stepping the level up and down."""
+
+    def test_raises_level_step_by_step(self):
+        """Test DEBUG -> INFO -> WARNING under sustained backpressure, short-circuiting records."""
+        controller, logger, log_queue, capture = _controller()
+        for _ in range(5):
+            log_queue.put(None)
+
+        controller.check()
+        assert logger.level == logging.INFO
+        assert not logger.isEnabledFor(logging.DEBUG)
+        controller.check()
+        assert logger.level == logging.WARNING
+        controller.check()
+        assert logger.level == logging.WARNING
+
+        assert capture.messages[0].startswith("Adaptive logging raised level to INFO (queue depth 5")
+        assert len(capture.messages) == 2
+
+    def test_restores_with_hysteresis(self):
+        """Test the level only goes back down once depth falls to the low watermark for the cooldown."""
+        controller, logger, log_queue, capture = _controller(cooldown=60)
+        for _ in range(5):
+            log_queue.put(None)
+        controller.check()
+        assert logger.level == logging.INFO
+
+        # Between the watermarks: stay raised
+        for _ in range(3):
+            log_queue.get()
+        controller.check()
+        assert logger.level == logging.INFO
+
+        # At the low watermark, but the cooldown has not passed
+        log_queue.get()
+        controller.check()
+        assert logger.level == logging.INFO
+
+        controller.cooldown = 0
+        controller.check()
+        assert logger.level == logging.DEBUG
+        assert capture.messages[-1].startswith("Adaptive logging restored level to DEBUG")
+
+    def test_sink_latency_counts_as_pressure(self):
+        """Test that a slow sink raises the level even with a short queue."""
+
+        class SlowListener:
+            latency = 0.5
+
+        controller, logger, _, _ = _controller(listener=SlowListener(), max_latency=0.1)
+        controller.check()
+        assert logger.level == logging.INFO
+
+    def test_stop_restores_base_level(self):
+        """Test stopping the controller puts the configured level back."""
+        controller, logger, log_queue, _ = _controller()
+        for _ in range(5):
+            log_queue.put(None)
+        controller.check()
+        controller.stop()
+        assert logger.level == logging.DEBUG
+
+    def test_descendants_with_own_level_throttled(self):
+        """Test child loggers with an explicit level are raised and restored with the controlled logger."""
+        child = logging.getLogger("adaptive_test.child")
+        child.setLevel(logging.DEBUG)
+        controller, logger, log_queue, _ = _controller()
+        for _ in range(5):
+            log_queue.put(None)
+
+        controller.check()
+        assert not child.isEnabledFor(logging.DEBUG)
+        controller.stop()
+        assert child.level == logging.DEBUG
+
+
+class TestAdaptiveConfig:
+    """Test adaptive mode through rootlog_config."""
+
+    def test_adaptive_queue_mode(self):
+        """Test a controller is attached to the queue and stopped on reconfiguration."""
+        logger = rootlog_config(app="adaptive-test", logger_name="adaptive_logger", log_f=False, use_queue=True, adaptive=True, adaptive_watermarks=(100, 10))
+        controller = logger._workers[0]
+        assert isinstance(controller, AdaptiveLevelController)
+        assert controller.queue is logger._queue_listeners[-1].queue
+        assert logger._queue_listeners[-1].track_latency
+
+        logger = rootlog_config(app="adaptive-test", logger_name="adaptive_logger", log_f=False)
+        assert controller._thread is None
+        assert logger._workers == []
+        for listener in logger._queue_listeners:
+            listener.stop()
+        logger.handlers.clear()
+
+    def test_root_config_throttles_existing_loggers(self):
+        """Test a logger created before rootlog_config (and pinned to INFO by it) is throttled too."""
+        early = logging.getLogger("adaptive_early")
+        rootlog_config(app="adaptive-test", log_f=False, log_c=True, use_queue=True, adaptive=True, adaptive_watermarks=(2, 1))
+        root = logging.getLogger()
+        controller = root._workers[0]
+        controller.stop()
+        # A private queue, so the listener does not take the placeholders for its stop sentinel
+        controller.queue = queue.Queue()
+        try:
+            assert early.level == logging.INFO
+            for _ in range(3):
+                controller.queue.put(None)
+            controller.check()
+            controller.check()
+            assert not early.isEnabledFor(logging.INFO)
+            assert early.isEnabledFor(logging.WARNING)
+
+            controller.stop()
+            assert early.isEnabledFor(logging.INFO)
+        finally:
+            logging.disable(logging.NOTSET)
+            for listener in root._queue_listeners:
+                listener.stop()
+            root._queue_listeners.clear()
+            root.handlers.clear()
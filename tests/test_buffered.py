@@ -0,0 +1,110 @@
+"""Tests for thread-local buffered logging."""
+
+import logging
+import threading
+
+from rootlog import rootlog_config
+from rootlog.buffered import BufferedHandler, BufferedListener
+
+
+class _CollectingHandler(logging.Handler):
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def _make_record(msg, created):
+    record = logging.LogRecord("buffered", logging.INFO, __file__, 1, msg, None, None)
+    record.created = created
+    return record
+
+
+class TestBufferedHandler:
+    """Test the lock-free per-thread buffers."""
+
+    def test_each_thread_gets_own_buffer(self):
+        """Test that every producer thread appends to its own buffer."""
+        handler = BufferedHandler()
+
+        def worker(thread_id):
+            for i in range(3):
+                handler.handle(_make_record(f"{thread_id}-{i}", float(i)))
+
+        threads = [threading.Thread(target=worker, args=[i]) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        batches = handler.swap_buffers()
+        assert len(batches) == 4
+        assert all(len(batch) == 3 for batch in batches)
+
+        # Buffers are empty after the swap and dead threads are forgotten
+        assert handler.swap_buffers() == []
+        assert handler._buffers == []
+
+    def test_merge_orders_by_timestamp(self):
+        """Test that the writer merges thread buffers by record creation time."""
+        handler = BufferedHandler()
+        sink = _CollectingHandler()
+        listener = BufferedListener(handler, sink)
+
+        def worker(times):
+            for created in times:
+                handler.handle(_make_record(str(created), created))
+
+        for times in ([1.0, 4.0, 5.0], [2.0, 3.0, 6.0]):
+            t = threading.Thread(target=worker, args=[times])
+            t.start()
+            t.join()
+
+        listener.flush()
+        assert [r.created for r in sink.records] == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+
+    def test_per_thread_order_preserved_on_ties(self):
+        """Test that records with equal timestamps keep their per-thread order."""
+        handler = BufferedHandler()
+        sink = _CollectingHandler()
+        listener = BufferedListener(handler, sink)
+
+        for i in range(5):
+            handler.handle(_make_record(str(i), 1.0))
+        listener.flush()
+
+        assert [r.msg for r in sink.records] == ["0", "1", "2", "3", "4"]
+
+    def test_respect_handler_level(self):
+        """Test that sink levels are honoured by the writer."""
+        handler = BufferedHandler()
+        sink = _CollectingHandler(level=logging.WARNING)
+        listener = BufferedListener(handler, sink)
+
+        handler.handle(_make_record("info", 1.0))
+        listener.flush()
+
+        assert sink.records == []
+
+
+class TestBufferedConfig:
+    """Test buffered mode through rootlog_config."""
+
+    def test_buffer_mode_setup(self):
+        """Test that buffer mode installs the buffer handler and writer."""
+        logger = rootlog_config(app="buffer-test", use_buffer=True, logger_name="test_buffer", log_f=False)
+
+        assert len(logger.handlers) == 1
+        assert isinstance(logger.handlers[0], BufferedHandler)
+        assert len(logger._queue_listeners) == 1
+
+        sink = _CollectingHandler()
+        listener = logger._queue_listeners[0]
+        listener.handlers = listener.handlers + (sink,)
+        logger.info("buffered message")
+        listener.stop()
+
+        assert [r.getMessage() for r in sink.records] == ["buffered message"]
+        logger.handlers.clear()
@@ -0,0 +1,122 @@
+"""Tests for contextvars-based context fields."""
+
+import asyncio
+import logging
+from contextvars import ContextVar
+
+import pytest
+
+from rootlog import rootlog_config
+from rootlog.context import ContextFilter
+from rootlog.network import _record_to_dict
+
+request_id = ContextVar("request_id")
+tenant = ContextVar("tenant")
+
+
+class _Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def _record(msg="hello"):
+    return logging.LogRecord("ctx", logging.INFO, __file__, 1, msg, None, None)
+
+
+class TestContextFilter:
+    """Test capturing context values onto records."""
+
+    def test_captures_values_and_default(self):
+        """Test set variables are copied and unset ones get the default."""
+        context_filter = ContextFilter([request_id, tenant], default="none")
+        token = request_id.set("req-1")
+        try:
+            record = _record()
+            assert context_filter.filter(record)
+        finally:
+            request_id.reset(token)
+        assert record.request_id == "req-1"
+        assert record.tenant == "none"
+        assert record.context_fields == ("request_id", "tenant")
+        assert logging.Formatter("%(request_id)s %(tenant)s %(message)s").format(record) == "req-1 none hello"
+
+    def test_mapping_names_and_first_capture_wins(self):
+        """Test custom field names, and that a second filter pass keeps the producer's values."""
+        context_filter = ContextFilter({"rid": request_id})
+        token = request_id.set("producer")
+        record = _record()
+        context_filter.filter(record)
+        request_id.reset(token)
+        context_filter.filter(record)
+        assert record.rid == "producer"
+
+    def test_reserved_names_rejected(self):
+        """Test that fields which would overwrite record attributes are refused up front."""
+        for fields in ([ContextVar("name")], {"message": request_id}, {"asctime": request_id}, {"context_fields": request_id}):
+            with pytest.raises(ValueError):
+                ContextFilter(fields)
+
+    def test_asyncio_tasks(self):
+        """Test interleaved asyncio tasks each log their own request id."""
+        logger = logging.getLogger("context_asyncio")
+        logger.handlers.clear()
+        logger.propagate = False
+        capture = _Capture()
+        capture.addFilter(ContextFilter([request_id]))
+        logger.addHandler(capture)
+
+        async def handle(rid):
+            request_id.set(rid)
+            for step in range(3):
+                logger.warning("step %d", step)
+                await asyncio.sleep(0)
+
+        async def main():
+            await asyncio.gather(*(handle(f"req-{i}") for i in range(5)))
+
+        asyncio.run(main())
+        assert len(capture.records) == 15
+        for record in capture.records:
+            assert record.request_id.startswith("req-")
+        assert {r.request_id for r in capture.records if r.getMessage() == "step 2"} == {f"req-{i}" for i in range(5)}
+
+    def test_json_keys(self):
+        """Test JSON sinks ship context fields as top-level keys."""
+        record = _record()
+        ContextFilter([request_id, tenant]).filter(record)
+        data = _record_to_dict(record)
+        assert data["request_id"] == "-" and data["tenant"] == "-"
+
+
+class TestContextConfig:
+    """Test context fields through rootlog_config."""
+
+    def test_values_survive_queue_hop(self, tmp_path, monkeypatch):
+        """Test values captured on the producer reach the file written by the listener thread."""
+        monkeypatch.setenv("PY_LOG_PATH", str(tmp_path))
+        logger = rootlog_config(
+            app="context-test",
+            logger_name="context_logger",
+            log_c=False,
+            use_queue=True,
+            context_fields=[request_id, tenant],
+            format_f="%(request_id)s %(tenant)s %(message)s",
+        )
+        token = request_id.set("req-42")
+        logger.info("inside request")
+        request_id.reset(token)
+        logger.info("outside request")
+
+        for listener in logger._queue_listeners:
+            listener.stop()
+        logger._queue_listeners = []
+        for handler in logger.handlers:
+            handler.close()
+        logger.handlers.clear()
+
+        lines = (tmp_path / "context-test" / "testing.log").read_text().splitlines()
+        assert lines == ["req-42 - inside request", "- - outside request"]
@@ -0,0 +1,105 @@
+"""Tests for fsync durability modes."""
+
+import logging
+import threading
+import time
+
+import pytest
+from rootlog import rootlog_config
+from rootlog.durability import DurableFileHandler
+from rootlog.resilient import ResilientFileHandler
+
+
+def _logger(tmp_path, mode, **kwargs):
+    handler = DurableFileHandler(logging.FileHandler(tmp_path / "app.log"), mode=mode, **kwargs)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = logging.getLogger(f"durability_{mode}")
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    return logger, handler
+
+
+class TestDurableFileHandler:
+    """Test when each mode fsyncs."""
+
+    def test_invalid_mode(self, tmp_path):
+        """Test unknown modes (and "none", which needs no wrapper) are rejected."""
+        with pytest.raises(ValueError):
+            DurableFileHandler(logging.FileHandler(tmp_path / "app.log"), mode="always")
+        with pytest.raises(ValueError):
+            DurableFileHandler(logging.FileHandler(tmp_path / "app.log"), mode="none")
+
+    def test_level_mode_syncs_errors_only(self, tmp_path):
+        """Test records below the level are written without an fsync."""
+        logger, handler = _logger(tmp_path, "level")
+        logger.info("routine")
+        assert handler.syncs == 0
+        logger.error("failure")
+        assert handler.syncs == 1
+        assert (tmp_path / "app.log").read_text() == "routine\nfailure\n"
+        handler.close()
+
+    def test_interval_mode(self, tmp_path):
+        """Test the background thread syncs dirty files and stop() syncs what is left."""
+        logger, handler = _logger(tmp_path, "interval", interval=0.01)
+        handler.start()
+        logger.info("one")
+        deadline = time.monotonic() + 5
+        while handler.syncs < 1 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert handler.syncs == 1
+
+        handler.stop()
+        logger.info("two")
+        handler.stop()
+        assert handler.syncs == 2
+        handler.close()
+
+    def test_group_commit_shares_fsyncs(self, tmp_path):
+        """Test concurrent error callers each wait for a covering fsync, sharing them."""
+        logger, handler = _logger(tmp_path, "group")
+        threads_count, per_thread = 8, 25
+        barrier = threading.Barrier(threads_count)
+
+        def worker(thread_id):
+            barrier.wait()
+            for i in range(per_thread):
+                logger.error("thread %d error %d", thread_id, i)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(threads_count)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert 1 <= handler.syncs <= threads_count * per_thread
+        assert handler._done == handler._started
+        assert len((tmp_path / "app.log").read_text().splitlines()) == threads_count * per_thread
+        handler.close()
+
+
+class TestDurabilityConfig:
+    """Test durability through rootlog_config."""
+
+    def test_wraps_resilient_file_handler(self, tmp_path, monkeypatch):
+        """Test the durable wrapper sits outside the resilient handler and is stopped on reconfiguration."""
+        monkeypatch.setenv("PY_LOG_PATH", str(tmp_path))
+        logger = rootlog_config(app="durability-test", logger_name="durability_logger", log_c=False, durability="interval", durability_interval=60, max_age="7 days")
+
+        file_handler = logger.handlers[0]
+        assert isinstance(file_handler, DurableFileHandler)
+        assert isinstance(file_handler.target, ResilientFileHandler)
+        assert file_handler in logger._workers
+        assert file_handler._thread is not None
+        assert str(file_handler.baseFilename) in {str(p) for p in logger._workers[1].protect}
+
+        logger.error("saved")
+        logger = rootlog_config(app="durability-test", logger_name="durability_logger", log_c=False)
+        assert file_handler._thread is None
+        assert file_handler.syncs == 1
+        file_handler.close()
+        for handler in logger.handlers:
+            handler.close()
+        logger.handlers.clear()
@@ -0,0 +1,113 @@
+"""Tests for fork-safe re-initialisation of listeners and file handles."""
+
+import logging
+import os
+import time
+
+import pytest
+from rootlog import rootlog_config
+from rootlog.forksafe import per_process_filename
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+
+
+def _fork(child):
+    """Run child() in a forked process and return its pid after it exited cleanly."""
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            child()
+            code = 0
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    return pid
+
+
+def _stop(logger):
+    for listener in getattr(logger, "_queue_listeners", []):
+        listener.stop()
+    for handler in logger.handlers:
+        handler.close()
+    logger.handlers.clear()
+
+
+class TestForkSafety:
+    """Test that forked children keep logging."""
+
+    def test_per_process_filename(self):
+        """Test the pid is inserted before the suffix."""
+        assert per_process_filename("/logs/app/20240101-12.log", 42) == "/logs/app/20240101-12.42.log"
+
+    def test_queue_listener_restarts_in_child(self, tmp_path, monkeypatch):
+        """Test that a child's records reach the file through its own listener."""
+        monkeypatch.setenv("PY_LOG_PATH", str(tmp_path))
+        logger = rootlog_config(app="fork-test", logger_name="fork_queue", log_c=False, use_queue=True)
+        parent_listener = logger._queue_listeners[0]
+        parent_queue = parent_listener.queue
+
+        def child():
+            logger.info("from child")
+            assert logger._queue_listeners[0].queue is not parent_queue
+            logger._queue_listeners[0].stop()
+
+        _fork(child)
+        logger.info("from parent")
+        _stop(logger)
+
+        # The parent keeps its own queue and listener
+        assert parent_listener.queue is parent_queue
+        lines = (tmp_path / "fork-test" / "testing.log").read_text().splitlines()
+        assert sorted(line.split(" ", 2)[2] for line in lines) == ["from child", "from parent"]
+
+    def test_buffer_writer_restarts_in_child(self, tmp_path, monkeypatch):
+        """Test that buffered mode gets a fresh writer thread in the child."""
+        monkeypatch.setenv("PY_LOG_PATH", str(tmp_path))
+        logger = rootlog_config(app="fork-buffer", logger_name="fork_buffer", log_c=False, use_buffer=True)
+
+        def child():
+            logger.info("buffered child")
+            logger._queue_listeners[0].stop()
+
+        _fork(child)
+        _stop(logger)
+        assert (tmp_path / "fork-buffer" / "testing.log").read_text().endswith("buffered child\n")
+
+    def test_per_process_file_in_child(self, tmp_path, monkeypatch):
+        """Test that parent and children each write to a pid-suffixed file when per_process is set."""
+        monkeypatch.setenv("PY_LOG_PATH", str(tmp_path))
+        logger = rootlog_config(app="fork-shard", logger_name="fork_shard", log_c=False, per_process=True)
+        logger.info("parent record")
+
+        pid = _fork(lambda: logger.info("child record"))
+        _stop(logger)
+
+        log_dir = tmp_path / "fork-shard"
+        assert (log_dir / f"testing.{os.getpid()}.log").read_text().splitlines()[-1].endswith("parent record")
+        assert (log_dir / f"testing.{pid}.log").read_text().splitlines()[-1].endswith("child record")
+
+    def test_adaptive_throttle_reset_in_child(self, tmp_path, monkeypatch):
+        """Test a child forked while the parent is throttled starts unthrottled with its own controller."""
+        monkeypatch.setenv("PY_LOG_PATH", str(tmp_path))
+        rootlog_config(app="fork-adaptive", log_c=False, use_queue=True, adaptive=True)
+        root = logging.getLogger()
+        controller = root._workers[0]
+        try:
+            controller._change(1, time.monotonic(), 0, 0.0)
+            assert root.manager.disable == logging.INFO - 1
+
+            def child():
+                assert root.manager.disable == logging.NOTSET
+                assert controller.step == 0
+                assert controller.queue is root._queue_listeners[0].queue
+                assert controller._thread.is_alive()
+
+            _fork(child)
+            assert root.manager.disable == logging.INFO - 1
+        finally:
+            controller.stop()
+            logging.disable(logging.NOTSET)
+            _stop(root)
+            root._queue_listeners.clear()
@@ -0,0 +1,89 @@
+"""Tests for traceback caching and duplicate-exception folding."""
+
+import logging
+import sys
+
+from rootlog import rootlog_config
+from rootlog.formatters import FoldingColoredFormatter, FoldingFormatter, exception_fingerprint
+
+
+def _raise(message="boom"):
+    raise ValueError(message)
+
+
+def _exc_info(func=_raise, *args):
+    try:
+        func(*args)
+    except Exception:
+        return sys.exc_info()
+
+
+def _record(exc_info):
+    return logging.LogRecord("fold", logging.ERROR, __file__, 1, "failed", None, exc_info)
+
+
+class TestFingerprint:
+    """Test exception fingerprints."""
+
+    def test_same_location_same_fingerprint(self):
+        """Test that the message does not affect the fingerprint, the location does."""
+        assert exception_fingerprint(_exc_info(_raise, "a")) == exception_fingerprint(_exc_info(_raise, "b"))
+
+        def other():
+            raise ValueError("boom")
+
+        assert exception_fingerprint(_exc_info(other)) != exception_fingerprint(_exc_info())
+
+
+class TestFoldingFormatter:
+    """Test folding repeated tracebacks."""
+
+    def test_first_full_then_folded(self):
+        """Test that repeats within the window become reference lines with a count."""
+        formatter = FoldingFormatter("%(message)s", fold_window=60)
+        fingerprint = exception_fingerprint(_exc_info())
+
+        first = formatter.format(_record(_exc_info()))
+        second = formatter.format(_record(_exc_info()))
+        third = formatter.format(_record(_exc_info()))
+
+        assert "Traceback (most recent call last)" in first
+        assert f"[exception {fingerprint}]" in first
+        assert second == f"failed\nValueError: boom [repeated exception {fingerprint}, 2 times in the last 0s]"
+        assert "3 times" in third
+
+    def test_window_expiry_renders_from_cache(self):
+        """Test that after the window the full traceback is written again."""
+        formatter = FoldingFormatter("%(message)s", fold_window=0)
+        first = formatter.format(_record(_exc_info()))
+        second = formatter.format(_record(_exc_info()))
+        assert first == second
+        assert len(formatter._fold_state[2]) == 1
+
+    def test_sinks_fold_independently(self):
+        """Test that a record shared by two sinks is rendered by each formatter."""
+        folding = FoldingFormatter("%(message)s")
+        plain = logging.Formatter("%(message)s")
+        folding.format(_record(_exc_info()))
+
+        record = _record(_exc_info())
+        assert "repeated exception" in folding.format(record)
+        assert "Traceback" in plain.format(record)
+
+
+class TestFoldingConfig:
+    """Test selecting folding through rootlog_config."""
+
+    def test_console_and_file_selection(self, tmp_path, monkeypatch):
+        """Test fold_exc_c and fold_exc_f pick the folding formatters."""
+        monkeypatch.setenv("PY_LOG_PATH", str(tmp_path))
+        logger = rootlog_config(app="fold-test", logger_name="fold_logger", fold_exc_c=True, fold_exc_f=True, fold_window=5)
+
+        console, file_handler = logger.handlers
+        assert isinstance(console.formatter, FoldingColoredFormatter)
+        assert console.formatter.log_colors["ERROR"] == "red"
+        assert isinstance(file_handler.formatter, FoldingFormatter)
+        assert file_handler.formatter.fold_window == 5
+
+        file_handler.close()
+        logger.handlers.clear()
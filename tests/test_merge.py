@@ -0,0 +1,114 @@
+"""Tests for per-process shards and the time-ordered merge reader."""
+
+import gzip
+import logging
+import os
+
+from rootlog import rootlog_config
+from rootlog.config import _create_file_handler
+from rootlog.merge import group_shards, main, merge_logs, read_records
+
+
+def _write(path, lines):
+    text = "".join(line + "\n" for line in lines)
+    if path.suffix == ".gz":
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        path.write_text(text)
+    return path
+
+
+class TestShardGrouping:
+    """Test grouping rotated and compressed files into shards."""
+
+    def test_rotated_files_ordered_oldest_first(self, tmp_path):
+        """Test that backups come before the live file, highest number first."""
+        for name in ["a.1.log", "a.1.log.1", "a.1.log.2.gz", "a.2.log", "a.2.log.2024-03-15_14"]:
+            _write(tmp_path / name, ["2024-01-01 10:00:00,000 INFO x"])
+
+        shards = group_shards([tmp_path])
+        assert [[p.name for p in files] for files in shards.values()] == [
+            ["a.1.log.2.gz", "a.1.log.1", "a.1.log"],
+            ["a.2.log.2024-03-15_14", "a.2.log"],
+        ]
+
+    def test_files_without_timestamps_skipped(self, tmp_path):
+        """Test that directory mode leaves out logs written without %(asctime)s."""
+        _write(tmp_path / "app.1.log", ["2024-01-01 10:00:00,000 INFO hello"])
+        _write(tmp_path / "plain.log", ["INFO hello", "INFO again"])
+        (tmp_path / "empty.log").write_text("")
+
+        assert [p.name for files in group_shards([tmp_path]).values() for p in files] == ["app.1.log"]
+
+    def test_shard_filename(self, tmp_path):
+        """Test the shard suffix goes between the base name and .log."""
+        handler = _create_file_handler(tmp_path, is_testing=True, rotation=None, level_f=logging.DEBUG, format_f="%(message)s", shard="worker-3")
+        assert handler.baseFilename.endswith("testing.worker-3.log")
+        handler.close()
+
+
+class TestMerge:
+    """Test the streaming k-way merge."""
+
+    def test_read_records_joins_continuation_lines(self, tmp_path):
+        """Test that traceback lines stay with their record."""
+        path = _write(tmp_path / "x.log", ["2024-01-01 10:00:00,000 ERROR boom", "Traceback (most recent call last):", "ValueError", "2024-01-01 10:00:01,000 INFO next"])
+        records = list(read_records(path))
+        assert [ts for ts, _ in records] == ["2024-01-01 10:00:00,000", "2024-01-01 10:00:01,000"]
+        assert records[0][1].count("\n") == 3
+
+    def test_read_records_without_timestamps_streams_lines(self, tmp_path, monkeypatch):
+        """Test that untimestamped lines are not accumulated into one record."""
+        monkeypatch.setattr("rootlog.merge.MAX_CONTINUATION_LINES", 2)
+        plain = _write(tmp_path / "plain.log", ["INFO one", "INFO two"])
+        assert list(read_records(plain)) == [("", "INFO one\n"), ("", "INFO two\n")]
+
+        long = _write(tmp_path / "long.log", ["2024-01-01 10:00:00,000 ERROR boom", "a", "b", "c", "d"])
+        records = list(read_records(long))
+        assert [ts for ts, _ in records] == ["2024-01-01 10:00:00,000"] * 2
+        assert "".join(text for _, text in records).count("\n") == 5
+
+    def test_merge_across_shards_and_rotations(self, tmp_path):
+        """Test records from all shards, rotated and gzipped files come out in time order."""
+        _write(tmp_path / "app.1.log.1.gz", ["2024-01-01 10:00:00,000 p1 first", "2024-01-01 10:00:03,000 p1 second"])
+        _write(tmp_path / "app.1.log", ["2024-01-01 10:00:05,000 p1 third"])
+        _write(tmp_path / "app.2.log", ["2024-01-01 10:00:01,000 p2 first", "  continued", "2024-01-01 10:00:04,000 p2 second"])
+
+        merged = "".join(merge_logs([tmp_path])).splitlines()
+        assert merged == [
+            "2024-01-01 10:00:00,000 p1 first",
+            "2024-01-01 10:00:01,000 p2 first",
+            "  continued",
+            "2024-01-01 10:00:03,000 p1 second",
+            "2024-01-01 10:00:04,000 p2 second",
+            "2024-01-01 10:00:05,000 p1 third",
+        ]
+
+    def test_cli_resolves_app_name(self, tmp_path, monkeypatch, capsys):
+        """Test that rootlog-merge accepts an app name under PY_LOG_PATH."""
+        monkeypatch.setenv("PY_LOG_PATH", str(tmp_path))
+        (tmp_path / "myapp").mkdir()
+        _write(tmp_path / "myapp" / "h.2.log", ["2024-01-01 10:00:02,000 b"])
+        _write(tmp_path / "myapp" / "h.1.log", ["2024-01-01 10:00:01,000 a"])
+
+        assert main(["myapp"]) == 0
+        assert capsys.readouterr().out.splitlines() == ["2024-01-01 10:00:01,000 a", "2024-01-01 10:00:02,000 b"]
+
+
+class TestPerProcessConfig:
+    """Test per-process files through rootlog_config."""
+
+    def test_per_process_shard_with_timestamps(self, tmp_path, monkeypatch):
+        """Test per_process writes a suffixed, timestamped file that merges cleanly."""
+        monkeypatch.setenv("PY_LOG_PATH", str(tmp_path))
+        logger = rootlog_config(app="shard-test", logger_name="shard_logger", log_c=False, per_process="worker-7", format_f="%(message)s")
+        logger.info("sharded")
+        for handler in logger.handlers:
+            handler.close()
+        logger.handlers.clear()
+
+        shard = tmp_path / "shard-test" / "testing.worker-7.log"
+        assert shard.exists()
+        assert [text.split(" ", 2)[2] for text in merge_logs([shard])] == ["sharded\n"]
+        assert not (tmp_path / "shard-test" / f"testing.{os.getpid()}.log").exists()
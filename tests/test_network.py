@@ -0,0 +1,304 @@
+"""Tests for network sinks against local stand-in servers."""
+
+import io
+import json
+import logging
+import socket
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from rootlog import rootlog_config
+from rootlog.network import BatchingNetworkHandler, HTTPBatchHandler, SyslogHandler, TCPJSONHandler, _parse_sink
+
+
+def _make_record(msg, level=logging.INFO):
+    return logging.LogRecord("net", level, __file__, 10, msg, None, None)
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class _TCPCollector(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, port=0):
+        self.received = b""
+        self.connections = 0
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(inner):
+                self.connections += 1
+                while True:
+                    data = inner.request.recv(65536)
+                    if not data:
+                        break
+                    self.received += data
+
+        super().__init__(("127.0.0.1", port), Handler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+@pytest.fixture
+def http_collector():
+    batches = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            batches.append(json.loads(body))
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server, batches
+    server.shutdown()
+    server.server_close()
+
+
+class TestSinkParsing:
+    """Test sink URL parsing."""
+
+    def test_parse_syslog(self):
+        """Test syslog URLs default to UDP on port 514."""
+        assert _parse_sink("syslog://logs.local") == {"type": "syslog", "host": "logs.local", "port": 514, "protocol": "udp"}
+        assert _parse_sink("syslog+tcp://logs.local:601")["protocol"] == "tcp"
+
+    def test_parse_tcp_and_http(self):
+        """Test raw TCP and HTTP sink URLs."""
+        assert _parse_sink("tcp://127.0.0.1:5170") == {"type": "tcp", "host": "127.0.0.1", "port": 5170}
+        assert _parse_sink("https://collector/ingest")["type"] == "http"
+
+    def test_parse_invalid(self):
+        """Test unsupported sinks are rejected."""
+        with pytest.raises(ValueError):
+            _parse_sink("ftp://nope")
+        with pytest.raises(ValueError):
+            _parse_sink("tcp://host-without-port")
+
+
+class TestNetworkSinks:
+    """Test shipping records to local servers."""
+
+    def test_incomplete_subclass_fails_on_construction(self):
+        """Test a sink missing one of the abstract methods can't be created (and no flusher starts)."""
+
+        class NoSend(BatchingNetworkHandler):
+            def make_payload(self, record):
+                return record.getMessage()
+
+            def _connect(self):
+                return None
+
+        with pytest.raises(TypeError):
+            NoSend()
+
+    def test_syslog_udp(self):
+        """Test RFC5424 datagrams over UDP."""
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server.bind(("127.0.0.1", 0))
+        server.settimeout(5)
+        handler = SyslogHandler("127.0.0.1", server.getsockname()[1], app_name="myapp", flush_interval=0.05)
+        try:
+            handler.handle(_make_record("hello syslog", logging.ERROR))
+            message = server.recv(4096).decode()
+            assert message.startswith("<11>1 ")
+            assert " myapp " in message
+            assert message.endswith("hello syslog")
+        finally:
+            handler.close()
+            server.close()
+
+    def test_syslog_udp_oversized_message(self, tmp_path):
+        """Test a record too big for a datagram is truncated, and one that still fails is dropped, not spilled."""
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server.bind(("127.0.0.1", 0))
+        server.settimeout(5)
+        spill = tmp_path / "syslog.spill"
+        handler = SyslogHandler("127.0.0.1", server.getsockname()[1], flush_interval=10, spill_path=spill)
+        try:
+            handler.handle(_make_record("x" * 70000))
+            for i in range(3):
+                handler.handle(_make_record(f"small {i}"))
+            handler.flush()
+            first = server.recv(70000)
+            assert len(first) == handler.max_datagram
+            assert [server.recv(4096).decode().rsplit(" ", 2)[-2:] for _ in range(3)] == [["small", str(i)] for i in range(3)]
+
+            # Larger than the kernel accepts: EMSGSIZE
+            handler.max_datagram = 10**6
+            handler.handle(_make_record("y" * 70000))
+            handler.handle(_make_record("after"))
+            handler.flush()
+            assert server.recv(4096).decode().endswith("after")
+            assert handler.dropped == 1
+            assert not spill.exists()
+        finally:
+            handler.close()
+            server.close()
+
+    def test_partial_batch_not_resent(self, tmp_path):
+        """Test that payloads sent before a mid-batch failure are not spilled and replayed again."""
+
+        class Flaky(BatchingNetworkHandler):
+            def __init__(self, **kwargs):
+                self.sent = []
+                self.fail_after = 1
+                super().__init__(**kwargs)
+
+            def make_payload(self, record):
+                return record.getMessage()
+
+            def _connect(self):
+                return io.BytesIO()
+
+            def _send(self, payloads):
+                for payload in payloads:
+                    if len(self.sent) == self.fail_after:
+                        raise OSError("connection reset")
+                    self.sent.append(payload)
+                    self._delivered += 1
+
+        spill = tmp_path / "flaky.spill"
+        handler = Flaky(flush_interval=10, spill_path=spill, retry_backoff=0)
+        try:
+            for name in ("a", "b", "c"):
+                handler.handle(_make_record(name))
+            handler.flush()
+            assert handler.sent == ["a"]
+            assert spill.read_text().split() == ['"b"', '"c"']
+
+            handler.fail_after = 2
+            handler.flush()
+            assert handler.sent == ["a", "b"]
+            assert spill.read_text().split() == ['"c"']
+
+            handler.fail_after = None
+            handler.flush()
+            assert handler.sent == ["a", "b", "c"]
+            assert not spill.exists()
+        finally:
+            handler.close()
+
+    def test_syslog_tcp_octet_counting(self):
+        """Test TCP syslog frames are octet counted."""
+        server = _TCPCollector()
+        handler = SyslogHandler("127.0.0.1", server.server_address[1], protocol="tcp", flush_interval=0.05)
+        try:
+            handler.handle(_make_record("first"))
+            handler.handle(_make_record("second"))
+            handler.flush()
+            assert _wait_for(lambda: server.received.count(b"<14>1 ") == 2)
+            length, _, rest = server.received.partition(b" ")
+            assert rest[: int(length)].endswith(b"first")
+        finally:
+            handler.close()
+            server.stop()
+
+    def test_tcp_json_batches_on_one_connection(self):
+        """Test NDJSON batches reuse the persistent connection."""
+        server = _TCPCollector()
+        handler = TCPJSONHandler("127.0.0.1", server.server_address[1], batch_size=2, flush_interval=10)
+        try:
+            for i in range(4):
+                handler.handle(_make_record(f"msg {i}"))
+            assert _wait_for(lambda: server.received.count(b"\n") == 4)
+            lines = [json.loads(line) for line in server.received.splitlines()]
+            assert [line["message"] for line in lines] == ["msg 0", "msg 1", "msg 2", "msg 3"]
+            assert server.connections == 1
+        finally:
+            handler.close()
+            server.stop()
+
+    def test_http_batch(self, http_collector):
+        """Test batches are POSTed as JSON arrays."""
+        server, batches = http_collector
+        handler = HTTPBatchHandler(f"http://127.0.0.1:{server.server_address[1]}/ingest", flush_interval=10)
+        try:
+            handler.handle(_make_record("a"))
+            handler.handle(_make_record("b"))
+            handler.flush()
+            assert [entry["message"] for entry in batches[0]] == ["a", "b"]
+        finally:
+            handler.close()
+
+    def test_spill_and_replay_when_endpoint_down(self, tmp_path):
+        """Test records are spilled while the endpoint is down and replayed in order."""
+        probe = socket.socket()
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+        probe.close()
+
+        spill = tmp_path / "sink.spill"
+        handler = TCPJSONHandler("127.0.0.1", port, flush_interval=10, spill_path=spill, retry_backoff=0.05)
+        server = None
+        try:
+            handler.handle(_make_record("while down"))
+            handler.flush()
+            assert spill.exists()
+
+            server = _TCPCollector(port)
+            time.sleep(0.1)
+            handler.handle(_make_record("after recovery"))
+            handler.flush()
+
+            assert _wait_for(lambda: server.received.count(b"\n") == 2)
+            messages = [json.loads(line)["message"] for line in server.received.splitlines()]
+            assert messages == ["while down", "after recovery"]
+            assert not spill.exists()
+        finally:
+            handler.close()
+            if server:
+                server.stop()
+
+    def test_spill_is_bounded(self, tmp_path):
+        """Test the spill file never grows past its byte budget."""
+        handler = TCPJSONHandler("127.0.0.1", 1, flush_interval=10, spill_path=tmp_path / "s.spill", spill_max_bytes=300, retry_backoff=60)
+        try:
+            for i in range(10):
+                handler.handle(_make_record(f"record {i}"))
+                handler.flush()
+            assert (tmp_path / "s.spill").stat().st_size <= 300
+            assert handler.dropped > 0
+        finally:
+            handler._retry_at = float("inf")
+            handler.close()
+
+
+class TestSinkConfig:
+    """Test network sinks through rootlog_config."""
+
+    def test_sinks_added_to_logger(self, http_collector):
+        """Test sink URLs become handlers with the file level."""
+        server, batches = http_collector
+        logger = rootlog_config(app="sink-test", logger_name="sink_logger", log_c=False, log_f=False, level_f=logging.INFO, sinks=[f"http://127.0.0.1:{server.server_address[1]}/"])
+
+        assert len(logger.handlers) == 1
+        handler = logger.handlers[0]
+        assert isinstance(handler, HTTPBatchHandler)
+        assert handler.level == logging.INFO
+
+        logger.info("configured sink")
+        handler.close()
+        assert batches[0][0]["message"] == "configured sink"
+        logger.handlers.clear()
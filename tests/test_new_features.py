@@ -5,6 +5,7 @@ import logging
 import os
 import threading
 import time
+from logging.handlers import QueueHandler
 from unittest.mock import patch
 
 from rootlog import rootlog_config
@@ -141,7 +142,7 @@ class TestQueueLogging:
         # Check that queue handler was added
         assert len(logger.handlers) == 1
         handler = logger.handlers[0]
-        assert handler.__class__.__name__ == "QueueHandler"
+        assert isinstance(handler, QueueHandler)
 
         # Check that queue listener was stored
         assert hasattr(logger, "_queue_listeners")
@@ -0,0 +1,94 @@
+"""Tests for deferred record preparation in queue mode."""
+
+import logging
+import queue
+import sys
+from collections import OrderedDict, defaultdict
+from types import MappingProxyType
+
+from rootlog.queueing import DeferredQueueHandler, prepare_record
+
+
+def _make_record(msg, args, exc_info=None):
+    return logging.LogRecord("queued", logging.INFO, __file__, 1, msg, args, exc_info)
+
+
+class TestPrepareRecord:
+    """Test the producer-side snapshot."""
+
+    def test_template_and_immutable_args_kept(self):
+        """Test that the message is not rendered for immutable args."""
+        args = ("user", 42, 1.5)
+        record = prepare_record(_make_record("%s has %d items at %.1f", args))
+
+        assert record.msg == "%s has %d items at %.1f"
+        assert record.args is args
+        assert record.getMessage() == "user has 42 items at 1.5"
+
+    def test_mutable_containers_copied(self):
+        """Test that later mutations by the caller don't leak into the record."""
+        items = [1, 2]
+        record = prepare_record(_make_record("items=%s", (items,)))
+        items.append(3)
+
+        assert record.msg == "items=%s"
+        assert record.getMessage() == "items=[1, 2]"
+
+    def test_mapping_args_copied(self):
+        """Test that a single dict argument is copied too."""
+        data = {"user": "ann"}
+        record = prepare_record(_make_record("%(user)s", (data,)))
+        data["user"] = "bob"
+
+        assert record.getMessage() == "ann"
+
+    def test_other_mapping_types_copied(self):
+        """Test that OrderedDict, defaultdict and MappingProxyType args are snapshotted too."""
+        proxied = {"user": "ann"}
+        for data, backing in ((OrderedDict(user="ann"), None), (defaultdict(str, user="ann"), None), (MappingProxyType(proxied), proxied)):
+            record = prepare_record(_make_record("%(user)s", (data,)))
+            (backing if backing is not None else data)["user"] = "bob"
+
+            assert type(record.args) is dict
+            assert record.getMessage() == "ann"
+
+    def test_arbitrary_objects_rendered_eagerly(self):
+        """Test that args of unknown types are rendered on the producer thread."""
+
+        class Counter:
+            value = 1
+
+            def __str__(self):
+                return f"counter={self.value}"
+
+        counter = Counter()
+        record = prepare_record(_make_record("%s", (counter,)))
+        counter.value = 2
+
+        assert record.msg == "counter=1"
+        assert record.args is None
+
+    def test_exc_info_kept_by_reference(self):
+        """Test that the traceback is not rendered on the producer thread."""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            exc_info = sys.exc_info()
+        record = prepare_record(_make_record("failed", None, exc_info))
+
+        assert record.exc_info is exc_info
+        assert record.exc_text is None
+
+
+class TestDeferredQueueHandler:
+    """Test the queue handler used by rootlog_config(use_queue=True)."""
+
+    def test_enqueued_record_is_formatted_by_consumer(self):
+        """Test that the record arrives unformatted and formats normally on the consumer side."""
+        log_queue = queue.Queue()
+        handler = DeferredQueueHandler(log_queue)
+        handler.handle(_make_record("hello %s", ("world",)))
+
+        record = log_queue.get_nowait()
+        assert record.msg == "hello %s"
+        assert logging.Formatter("%(message)s").format(record) == "hello world"
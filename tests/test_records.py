@@ -0,0 +1,147 @@
+"""Tests for the compact LogRecord factory."""
+
+import copy
+import logging
+import pickle
+import sys
+import threading
+
+import pytest
+from rootlog import rootlog_config
+from rootlog.queueing import prepare_record
+from rootlog.records import CompactLogRecord
+
+
+def _records(msg="hello %s", args=("world",)):
+    stdlib = logging.LogRecord("compact", logging.WARNING, "/src/app/views.py", 12, msg, args, None, "index")
+    compact = CompactLogRecord("compact", logging.WARNING, "/src/app/views.py", 12, msg, args, None, "index")
+    return stdlib, compact
+
+
+@pytest.fixture
+def compact_factory():
+    logging.setLogRecordFactory(CompactLogRecord)
+    yield
+    logging.setLogRecordFactory(logging.LogRecord)
+
+
+class TestCompactLogRecord:
+    """Test compatibility with the stdlib LogRecord."""
+
+    def test_same_attributes_as_stdlib(self):
+        """Test eager and lazy attributes match what LogRecord computes."""
+        stdlib, compact = _records()
+        for name in ("name", "msg", "args", "levelname", "levelno", "pathname", "filename", "module", "lineno", "funcName", "thread", "threadName", "process", "processName", "exc_text"):
+            assert getattr(compact, name) == getattr(stdlib, name), name
+        assert compact.getMessage() == "hello world"
+        assert 0 <= compact.msecs < 1000
+        assert compact.relativeCreated > 0
+        assert set(compact.__dict__) == set(stdlib.__dict__)
+
+    def test_lazy_attributes_are_cached(self):
+        """Test lazy attributes are computed once on first access and stored in their slot."""
+        _, compact = _records()
+        assert object.__getattribute__(compact, "__class__") is CompactLogRecord
+        with pytest.raises(AttributeError):
+            object.__getattribute__(compact, "filename")
+        assert compact.filename == "views.py"
+        assert object.__getattribute__(compact, "filename") == "views.py"
+        with pytest.raises(AttributeError):
+            compact.missing
+
+    def test_thread_name_from_ident(self):
+        """Test threadName resolves to the thread that created the record, even when read elsewhere."""
+        records, created, done = [], threading.Event(), threading.Event()
+
+        def worker():
+            records.append(_records()[1])
+            records.append(prepare_record(_records()[1]))
+            created.set()
+            done.wait()
+
+        thread = threading.Thread(target=worker, name="worker-7")
+        thread.start()
+        assert created.wait(5)
+        live, prepared = records
+        assert live.threadName == "worker-7"
+        done.set()
+        thread.join()
+        # Queued records keep the name resolved on the producer after the thread is gone
+        assert prepared.threadName == "worker-7"
+
+    def test_dict_view(self):
+        """Test the __dict__ view reads, writes and deletes slots and extra attributes."""
+        _, compact = _records()
+        view = compact.__dict__
+        assert view["levelname"] == "WARNING"
+        assert "filename" in view and "message" not in view and "getMessage" not in view
+        assert view.get("request_id", "-") == "-"
+
+        view["request_id"] = "req-1"
+        view.update({"levelname": "WARN"})
+        assert compact.request_id == "req-1"
+        assert compact.levelname == "WARN"
+        assert dict(view)["request_id"] == "req-1"
+        del view["request_id"]
+        assert "request_id" not in view
+
+    def test_dict_view_copy(self):
+        """Test record.__dict__.copy() returns a detached plain dict, as with the stdlib record."""
+        stdlib, compact = _records()
+        snapshot = compact.__dict__.copy()
+        compact.levelname = "WARN"
+
+        assert type(snapshot) is dict
+        assert snapshot["levelname"] == "WARNING"
+        assert snapshot.keys() == stdlib.__dict__.copy().keys()
+
+    def test_formatters(self):
+        """Test %, {} and Formatter(defaults=...) formatting."""
+        stdlib, compact = _records()
+        fmt = "%(levelname)s %(filename)s:%(lineno)d %(funcName)s %(threadName)s %(message)s"
+        assert logging.Formatter(fmt).format(compact) == logging.Formatter(fmt).format(stdlib)
+        assert logging.Formatter("{module} {message}", style="{").format(compact) == "views hello world"
+        if sys.version_info >= (3, 10):
+            assert logging.Formatter("%(tenant)s %(message)s", defaults={"tenant": "-"}).format(compact) == "- hello world"
+
+    def test_copy_and_pickle(self, compact_factory):
+        """Test copies keep slots and extras, and pickles round-trip through makeLogRecord."""
+        record = logging.getLogger("compact").makeRecord("compact", logging.INFO, "/src/a.py", 1, "x=%d", (1,), None, extra={"user": "bob"})
+        assert isinstance(record, CompactLogRecord)
+
+        clone = copy.copy(record)
+        assert clone is not record
+        assert (clone.msg, clone.args, clone.user) == ("x=%d", (1,), "bob")
+        clone.user = "alice"
+        assert record.user == "bob"
+
+        restored = pickle.loads(pickle.dumps(record))
+        assert restored.getMessage() == "x=1"
+        assert restored.user == "bob"
+        assert restored.filename == "a.py"
+
+    def test_extra_cannot_overwrite(self, compact_factory):
+        """Test makeRecord still refuses extra keys that clash with record attributes."""
+        with pytest.raises(KeyError):
+            logging.getLogger("compact").makeRecord("compact", logging.INFO, "/src/a.py", 1, "x", (), None, extra={"filename": "evil"})
+
+
+class TestCompactRecordsConfig:
+    """Test compact_records through rootlog_config."""
+
+    def test_factory_installed_and_restored(self, tmp_path, monkeypatch):
+        """Test the factory is installed for queue logging and removed on reconfiguration."""
+        monkeypatch.setenv("PY_LOG_PATH", str(tmp_path))
+        logger = rootlog_config(app="compact-test", logger_name="compact_logger", log_c=False, use_queue=True, compact_records=True, format_f="%(levelname)s %(filename)s %(threadName)s %(message)s")
+        assert logging.getLogRecordFactory() is CompactLogRecord
+        logger.info("queued %d", 1)
+
+        for listener in logger._queue_listeners:
+            listener.stop()
+        logger._queue_listeners = []
+        for handler in logger.handlers:
+            handler.close()
+
+        logger = rootlog_config(app="compact-test", logger_name="compact_logger", log_c=False, log_f=False)
+        assert logging.getLogRecordFactory() is logging.LogRecord
+        assert (tmp_path / "compact-test" / "testing.log").read_text() == "INFO test_records.py MainThread queued 1\n"
@@ -0,0 +1,118 @@
+"""Tests for degraded-disk resilience of the file sink."""
+
+import errno
+import io
+import logging
+import time
+from logging.handlers import RotatingFileHandler
+
+from rootlog import rootlog_config
+from rootlog.resilient import ResilientFileHandler
+
+
+class FaultyStream(io.StringIO):
+    """Stand-in for a file on a failing filesystem: raises or stalls on demand."""
+
+    def __init__(self):
+        super().__init__()
+        self.fail = False
+        self.delay = 0.0
+
+    def write(self, s):
+        if self.fail:
+            raise OSError(errno.ENOSPC, "No space left on device")
+        if self.delay:
+            time.sleep(self.delay)
+        return super().write(s)
+
+
+def _make_record(msg):
+    return logging.LogRecord("disk", logging.INFO, __file__, 1, msg, None, None)
+
+
+def _make_handler(tmp_path, **kwargs):
+    target = RotatingFileHandler(tmp_path / "app.log", maxBytes=1_000_000, backupCount=1, delay=True)
+    stream = FaultyStream()
+    target._open = lambda: stream
+    handler = ResilientFileHandler(target, **kwargs)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    return handler, stream
+
+
+class TestResilientFileHandler:
+    """Test spilling to memory and recovering."""
+
+    def test_write_failure_spills_without_handle_error(self, tmp_path, capsys):
+        """Test ENOSPC diverts records to the spill instead of printing tracebacks."""
+        handler, stream = _make_handler(tmp_path, retry_backoff=60)
+        stream.fail = True
+
+        for i in range(3):
+            handler.handle(_make_record(f"lost {i}"))
+
+        assert handler.degraded_since is not None
+        assert [msg for _, msg in handler.spill] == ["lost 0", "lost 1", "lost 2"]
+        assert capsys.readouterr().err == ""
+
+    def test_recovery_replays_spill_in_order(self, tmp_path):
+        """Test the spill is replayed once the disk recovers, followed by one summary."""
+        handler, _ = _make_handler(tmp_path, retry_backoff=0)
+        failing = FaultyStream()
+        failing.fail = True
+        recovered = FaultyStream()
+        streams = iter([failing, recovered])
+        handler.target._open = lambda: next(streams)
+
+        handler.handle(_make_record("first"))
+        handler.handle(_make_record("second"))
+        handler.handle(_make_record("third"))
+
+        lines = recovered.getvalue().splitlines()
+        assert len(lines) == 4
+        assert lines[0] == "first"
+        assert lines[1].startswith("File logging degraded")
+        assert lines[2:] == ["second", "third"]
+        assert handler.degraded_since is None
+        assert not handler.spill
+
+    def test_spill_is_bounded(self, tmp_path):
+        """Test the oldest spilled records are dropped once the spill is full."""
+        handler, stream = _make_handler(tmp_path, spill_capacity=2, retry_backoff=60)
+        stream.fail = True
+
+        for i in range(5):
+            handler.handle(_make_record(f"r{i}"))
+
+        assert [msg for _, msg in handler.spill] == ["r3", "r4"]
+        assert handler.dropped == 3
+
+    def test_slow_write_degrades(self, tmp_path):
+        """Test a stalled write diverts the following records to memory."""
+        handler, stream = _make_handler(tmp_path, slow_write=0.01, retry_backoff=60)
+        stream.delay = 0.05
+
+        handler.handle(_make_record("slow"))
+        handler.handle(_make_record("spilled"))
+
+        assert stream.getvalue() == "slow\n"
+        assert [msg for _, msg in handler.spill] == ["spilled"]
+
+
+class TestResilientConfig:
+    """Test the resilient file sink through rootlog_config."""
+
+    def test_file_handler_is_wrapped(self, tmp_path, monkeypatch):
+        """Test rootlog_config wraps the file handler by default and can opt out."""
+        monkeypatch.setenv("PY_LOG_PATH", str(tmp_path))
+
+        logger = rootlog_config(app="resilient-test", logger_name="resilient_logger", log_c=False)
+        handler = logger.handlers[0]
+        assert isinstance(handler, ResilientFileHandler)
+        assert isinstance(handler.target, RotatingFileHandler)
+        assert handler.level == logging.DEBUG
+        handler.close()
+
+        logger = rootlog_config(app="resilient-test", logger_name="resilient_logger", log_c=False, resilient=False)
+        assert isinstance(logger.handlers[0], RotatingFileHandler)
+        logger.handlers[0].close()
+        logger.handlers.clear()
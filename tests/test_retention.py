@@ -0,0 +1,143 @@
+"""Tests for the directory-wide retention janitor."""
+
+import os
+import time
+
+import pytest
+from rootlog import rootlog_config
+from rootlog.retention import RetentionJanitor, _parse_age, _parse_size
+
+
+def _make_file(path, size, age):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+class TestRetentionParsing:
+    """Test size and age parsing."""
+
+    def test_parse_size(self):
+        """Test byte budgets with and without units."""
+        assert _parse_size(1000) == 1000
+        assert _parse_size("500 KB") == 500 * 1024
+        assert _parse_size("1.5 GB") == int(1.5 * 1024**3)
+
+    def test_parse_age(self):
+        """Test ages in seconds and human-readable units."""
+        assert _parse_age(3600) == 3600.0
+        assert _parse_age("12 hours") == 12 * 3600
+        assert _parse_age("7 days") == 7 * 86400
+        assert _parse_age("2 weeks") == 14 * 86400
+
+    def test_parse_invalid(self):
+        """Test invalid values are rejected."""
+        with pytest.raises(ValueError):
+            _parse_size("lots")
+        with pytest.raises(ValueError):
+            _parse_age("forever")
+
+
+class TestRetentionJanitor:
+    """Test retention passes."""
+
+    def test_size_budget_deletes_oldest_first(self, tmp_path):
+        """Test that the oldest files go first until the budget is met."""
+        oldest = _make_file(tmp_path / "20240101-10.log.3", 400, age=3000)
+        middle = _make_file(tmp_path / "20240101-10.log.2", 400, age=2000)
+        newest = _make_file(tmp_path / "20240101-10.log.1", 400, age=1000)
+
+        janitor = RetentionJanitor(tmp_path, max_bytes=900, grace=0, batch_size=1)
+        assert janitor.run_once() == 1
+        assert not oldest.exists()
+        assert middle.exists() and newest.exists()
+
+    def test_size_budget_spares_live_files(self, tmp_path):
+        """Test the byte budget only removes rotated backups, not live files of any hour."""
+        current_hour = time.strftime("%Y%m%d-%H")
+        rotated = _make_file(tmp_path / "app.log.1", 400, age=5000)
+        compressed = _make_file(tmp_path / "app.log.2.gz", 400, age=4500)
+        shard = _make_file(tmp_path / "app.4242.log", 400, age=4000)
+        live = _make_file(tmp_path / "testing.log", 400, age=3000)
+        hourly = _make_file(tmp_path / f"{current_hour}.4243.log", 400, age=2000)
+
+        janitor = RetentionJanitor(tmp_path, max_bytes=1, grace=0)
+        assert janitor.run_once() == 2
+        assert not rotated.exists() and not compressed.exists()
+        assert shard.exists() and live.exists() and hourly.exists()
+
+        # max_age still applies to live files
+        janitor = RetentionJanitor(tmp_path, max_age=3500, grace=0)
+        assert janitor.run_once() == 1
+        assert not shard.exists()
+
+    def test_size_budget_spares_open_past_hour_file(self, tmp_path):
+        """Test a file named after an earlier hour, still open in a long-running process, is kept."""
+        past_hour = time.strftime("%Y%m%d-%H", time.localtime(time.time() - 7200))
+        path = _make_file(tmp_path / f"{past_hour}.log", 400, age=120)
+        with open(path, "a") as still_writing:
+            janitor = RetentionJanitor(tmp_path, max_bytes=1, grace=60)
+            assert janitor.run_once() == 0
+            assert path.exists()
+            still_writing.write("next record\n")
+
+    def test_max_age(self, tmp_path):
+        """Test that files older than max_age are deleted, including rotated backups."""
+        old = _make_file(tmp_path / "20240101-10.log.1", 10, age=2 * 86400)
+        recent = _make_file(tmp_path / "20240103-10.log", 10, age=60)
+
+        janitor = RetentionJanitor(tmp_path, max_age="1 day", grace=0)
+        assert janitor.run_once() == 1
+        assert not old.exists()
+        assert recent.exists()
+
+    def test_protected_and_grace(self, tmp_path):
+        """Test that active files and recently modified files are kept."""
+        active = _make_file(tmp_path / "active.log", 500, age=5000)
+        fresh = _make_file(tmp_path / "fresh.log", 500, age=1)
+        other = _make_file(tmp_path / "notes.txt", 500, age=5000)
+
+        janitor = RetentionJanitor(tmp_path, max_bytes=1, grace=30, protect=[active])
+        assert janitor.run_once() == 0
+        assert active.exists() and fresh.exists() and other.exists()
+
+    def test_all_scope_scans_subdirectories(self, tmp_path):
+        """Test that a janitor rooted at PY_LOG_PATH covers every app directory."""
+        app_a = _make_file(tmp_path / "a" / "old.log", 10, age=10 * 86400)
+        app_b = _make_file(tmp_path / "b" / "old.log", 10, age=10 * 86400)
+
+        janitor = RetentionJanitor(tmp_path, max_age="7 days", grace=0)
+        assert janitor.run_once() == 2
+        assert not app_a.exists() and not app_b.exists()
+
+
+class TestRetentionConfig:
+    """Test retention through rootlog_config."""
+
+    def test_janitor_started_and_replaced(self, tmp_path, monkeypatch):
+        """Test janitors are started by rootlog_config and replaced on reconfiguration."""
+        monkeypatch.setenv("PY_LOG_PATH", str(tmp_path))
+        stale = _make_file(tmp_path / "retention-test" / "19990101-00.log", 10, age=30 * 86400)
+
+        logger = rootlog_config(app="retention-test", logger_name="retention_logger", log_c=False, max_age="7 days")
+        assert len(logger._workers) == 1
+        first = logger._workers[0]
+        assert first.root == tmp_path / "retention-test"
+        assert str(first.protect.pop()).startswith(str(tmp_path))
+
+        deadline = time.monotonic() + 5
+        while stale.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not stale.exists()
+
+        logger = rootlog_config(app="retention-test", logger_name="retention_logger", log_c=False, max_total_size="1 GB", retention_scope="all")
+        assert first._thread is None
+        assert logger._workers[0].root == tmp_path
+
+        for janitor in logger._workers:
+            janitor.stop()
+        for handler in logger.handlers:
+            handler.close()
+        logger.handlers.clear()
@@ -0,0 +1,131 @@
+"""Tests for rolling up high-volume records into periodic summaries."""
+
+import logging
+
+import pytest
+from rootlog import rootlog_config
+from rootlog.rollup import RollupFilter
+
+
+class _Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def _logger(name, rollup):
+    logger = logging.getLogger(name)
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    handler = _Capture()
+    handler.addFilter(rollup)
+    logger.addHandler(handler)
+    return logger, handler
+
+
+class TestRollupFilter:
+    """Test counting and summarising selected records."""
+
+    def test_requires_selection(self):
+        """Test a rollup without loggers or level is rejected."""
+        with pytest.raises(ValueError):
+            RollupFilter(_Capture())
+
+    def test_counts_per_call_site_and_drops(self):
+        """Test selected records are counted per template and call site and never emitted."""
+        sink = _Capture()
+        rollup = RollupFilter(sink, loggers=["chatty"])
+        chatty, chatty_out = _logger("chatty.db", rollup)
+        other, other_out = _logger("other", rollup)
+
+        for i in range(5):
+            chatty.debug("query %d", i)
+        chatty.debug("query %d", 99)  # same template, different call site
+        other.info("kept")
+
+        assert chatty_out.records == []
+        assert [r.getMessage() for r in other_out.records] == ["kept"]
+
+        rollup.flush()
+        (summary,) = sink.records
+        lines = summary.getMessage().splitlines()
+        assert lines[0].startswith("Rollup: 6 records from 2 call sites")
+        assert lines[1].strip().startswith("5x DEBUG chatty.db test_rollup.py:")
+        assert lines[1].endswith("'query %d'")
+        assert lines[2].strip().startswith("1x DEBUG chatty.db")
+
+        rollup.flush()
+        assert len(sink.records) == 1
+
+    def test_level_selection_and_stats(self):
+        """Test level-based selection and min/max/mean of numeric args."""
+        sink = _Capture()
+        rollup = RollupFilter(sink, level=logging.DEBUG, stats=True)
+        logger, out = _logger("level_rollup", rollup)
+
+        for ms in (10, 30, 20):
+            logger.debug("took %s ms for %s", ms, "users")
+        logger.info("kept")
+        rollup.flush()
+
+        assert [r.getMessage() for r in out.records] == ["kept"]
+        assert "arg0[min=10 max=30 mean=20]" in sink.records[0].getMessage()
+        assert "arg1" not in sink.records[0].getMessage()
+
+    def test_counted_once_across_handlers(self):
+        """Test that a record seen by several handlers carrying the filter is counted once."""
+        sink = _Capture()
+        rollup = RollupFilter(sink, loggers=["twice"])
+        logger, first = _logger("twice", rollup)
+        second = _Capture()
+        second.addFilter(rollup)
+        logger.addHandler(second)
+
+        logger.debug("hello")
+        rollup.flush()
+        assert "Rollup: 1 records" in sink.records[0].getMessage()
+        assert first.records == second.records == []
+
+    def test_max_keys_overflow(self):
+        """Test that call sites beyond max_keys are still counted."""
+        sink = _Capture()
+        rollup = RollupFilter(sink, loggers=["many"], max_keys=1)
+        logger, _ = _logger("many", rollup)
+        logger.debug("first")
+        logger.debug("second")
+        rollup.flush()
+        assert "1x from further call sites" in sink.records[0].getMessage()
+
+
+class TestRollupConfig:
+    """Test rollup through rootlog_config."""
+
+    @pytest.mark.parametrize("use_queue", [False, True])
+    def test_summary_written_to_file(self, tmp_path, monkeypatch, use_queue):
+        """Test that only the summary of the rolled-up logger reaches the file."""
+        monkeypatch.setenv("PY_LOG_PATH", str(tmp_path))
+        logger = rootlog_config(app="rollup-test", logger_name="rollup_app", format_f="%(name)s %(message)s", use_queue=use_queue, rollup_loggers=["rollup_app.chatty"], rollup_window=3600)
+        rollup = logger._workers[0]
+        assert isinstance(rollup, RollupFilter)
+
+        chatty = logging.getLogger("rollup_app.chatty")
+        for i in range(1000):
+            chatty.info("tick %d", i)
+        logger.info("kept")
+
+        rollup.stop()
+        for listener in getattr(logger, "_queue_listeners", []):
+            listener.stop()
+        logger._queue_listeners = []
+        for handler in logger.handlers:
+            handler.close()
+        logger.handlers.clear()
+
+        text = (tmp_path / "rollup-test" / "testing.log").read_text()
+        assert "tick" not in text.replace("'tick %d'", "")
+        assert "rollup_app kept" in text
+        assert "rootlog.rollup Rollup: 1000 records from 1 call sites" in text
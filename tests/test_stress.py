@@ -0,0 +1,85 @@
+"""Tests for the stress-test load generator."""
+
+import json
+import logging
+import os
+
+import pytest
+from rootlog.stress import _parse_levels, _percentile, main, run_stress
+
+
+def _options(tmp_path, **overrides):
+    options = {
+        "config": {"logger_name": "stress_logger"},
+        "threads": 2,
+        "processes": 1,
+        "rate": 400,
+        "rate_per_thread": 200,
+        "duration": 0.3,
+        "size": 50,
+        "levels": {logging.INFO: 1, logging.ERROR: 1},
+        "exc_ratio": 1.0,
+        "app": "stress-test",
+        "log_path": str(tmp_path),
+        "sample_interval": 0.05,
+        "seed": 0,
+    }
+    options.update(overrides)
+    return options
+
+
+class TestStressHelpers:
+    """Test level mixes and percentiles."""
+
+    def test_parse_levels(self):
+        """Test level mixes are parsed into weights by level number."""
+        assert _parse_levels("debug=60,INFO=30,ERROR") == {logging.DEBUG: 60.0, logging.INFO: 30.0, logging.ERROR: 1.0}
+        with pytest.raises(ValueError):
+            _parse_levels("LOUD=1")
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles over sorted values."""
+        values = list(range(1000))
+        assert _percentile(values, 0.5) == 500
+        assert _percentile(values, 0.999) == 999
+        assert _percentile([], 0.5) == 0.0
+
+
+class TestRunStress:
+    """Test running load against real configurations."""
+
+    def test_direct_mode_paced(self, tmp_path):
+        """Test a paced run writes every record, tracebacks included, and reports it."""
+        report = run_stress(_options(tmp_path))
+        assert 0 < report["records"] <= 2 * 200 * 0.3 + 2
+        assert report["latency_us"]["p50"] <= report["latency_us"]["p99"] <= report["latency_us"]["max"]
+        assert report["queue_depth"]["samples"] == [[]]
+        assert report["bytes_on_disk"] > 0
+
+        text = (tmp_path / "stress-test" / "testing.log").read_text()
+        assert text.count("request ") == report["records"]
+        assert "RuntimeError: simulated failure" in text
+
+    def test_queue_mode_samples_depth(self, tmp_path):
+        """Test queue depth is sampled when the configuration uses a queue."""
+        report = run_stress(_options(tmp_path, config={"logger_name": "stress_logger", "use_queue": True}, rate=0, rate_per_thread=0))
+        assert report["queue_depth"]["samples"][0]
+        assert report["end_to_end_rps"] <= report["throughput_rps"]
+
+    def test_log_path_env_restored(self, tmp_path, monkeypatch):
+        """Test the run does not leave its PY_LOG_PATH behind for later callers."""
+        monkeypatch.setenv("PY_LOG_PATH", "/somewhere/else")
+        run_stress(_options(tmp_path, duration=0.05))
+        assert os.environ["PY_LOG_PATH"] == "/somewhere/else"
+
+        monkeypatch.delenv("PY_LOG_PATH")
+        run_stress(_options(tmp_path, duration=0.05))
+        assert "PY_LOG_PATH" not in os.environ
+
+    def test_cli_json_with_processes(self, tmp_path, capsys):
+        """Test the CLI with several processes and a JSON report."""
+        assert main(["--processes", "2", "--threads", "1", "--rate", "200", "--duration", "0.3", "--log-path", str(tmp_path), "--json", "--config", '{"per_process": true}']) == 0
+        report = json.loads(capsys.readouterr().out)
+        assert report["records"] > 0
+        assert len(report["queue_depth"]["samples"]) == 2
+        assert len(list((tmp_path / "stress").glob("*.log"))) == 2
@@ -0,0 +1,148 @@
+"""Tests for following app logs across rotations."""
+
+import logging
+import os
+import threading
+from logging.handlers import RotatingFileHandler
+
+from rootlog.tail import AppFollower, LineFilter, follow
+
+
+def _append(path, text):
+    with open(path, "a") as f:
+        f.write(text)
+
+
+class TestAppFollower:
+    """Test following files in an app directory."""
+
+    def test_starts_at_end_and_reads_new_lines(self, tmp_path):
+        """Test existing content is skipped and partial lines wait for their newline."""
+        log = tmp_path / "20240101-10.log"
+        log.write_text("old line\n")
+        follower = AppFollower(tmp_path)
+
+        _append(log, "new line\npartial")
+        assert follower.poll() == [b"new line"]
+        _append(log, " done\n")
+        assert follower.poll() == [b"partial done"]
+        follower.close()
+
+    def test_follows_rotation(self, tmp_path):
+        """Test that RotatingFileHandler rollovers are followed without losing lines."""
+        log = tmp_path / "app.log"
+        handler = RotatingFileHandler(log, maxBytes=60, backupCount=3)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log.touch()
+        follower = AppFollower(tmp_path)
+
+        lines = []
+        for i in range(10):
+            handler.emit(logging.LogRecord("t", logging.INFO, __file__, 1, f"record number {i}", None, None))
+            if i % 3 == 0:
+                lines.extend(follower.poll())
+        lines.extend(follower.poll())
+        handler.close()
+        follower.close()
+
+        assert (tmp_path / "app.log.1").exists()
+        assert [line.decode() for line in lines] == [f"record number {i}" for i in range(10)]
+
+    def test_picks_up_new_hourly_file(self, tmp_path):
+        """Test that a newly created live file is followed from its start."""
+        _append(tmp_path / "20240101-10.log", "hour ten\n")
+        follower = AppFollower(tmp_path, rescan_interval=0)
+        assert follower.poll() == []
+
+        _append(tmp_path / "20240101-11.log", "hour eleven\n")
+        assert follower.poll() == []  # idle poll triggers the rescan
+        assert follower.poll() == [b"hour eleven"]
+        follower.close()
+
+    def test_truncation(self, tmp_path):
+        """Test that a file truncated in place is read again from the start."""
+        log = tmp_path / "app.log"
+        log.write_text("a long line before truncation\n")
+        follower = AppFollower(tmp_path)
+        with open(log, "w") as f:
+            f.write("short\n")
+        follower.poll()
+        assert follower.poll() == [b"short"]
+        follower.close()
+
+
+    def test_drops_deleted_files(self, tmp_path):
+        """Test that a deleted file is closed once drained and a recreated one is read from its start."""
+        log = tmp_path / "app.log"
+        log.write_text("")
+        follower = AppFollower(tmp_path, rescan_interval=0)
+        _append(log, "last words\n")
+        log.unlink()
+
+        assert follower.poll() == [b"last words"]
+        assert follower.poll() == []
+        assert follower.files == {}
+
+        _append(log, "reborn\n")
+        assert follower.poll() == []
+        assert follower.poll() == [b"reborn"]
+        follower.close()
+
+    def test_drops_idle_files_and_resumes(self, tmp_path):
+        """Test that older idle files are not followed until they are written again."""
+        old, new = tmp_path / "20240101-10.log", tmp_path / "20240101-11.log"
+        _append(old, "hour ten\n")
+        _append(new, "hour eleven\n")
+        os.utime(old, (1000, 1000))
+        follower = AppFollower(tmp_path, rescan_interval=0, concurrent=0)
+        assert set(follower.files) == {new}
+
+        _append(old, "late\n")
+        assert follower.poll() == []
+        assert follower.poll() == [b"late"]
+        # Now the hour eleven file is the older idle one
+        assert set(follower.files) == {old}
+        follower.close()
+
+
+class TestLineFilter:
+    """Test level and regex filtering."""
+
+    def test_level_and_continuation_lines(self):
+        """Test that traceback lines follow the decision for their record."""
+        line_filter = LineFilter(level=logging.WARNING)
+        lines = [b"INFO x.py:1:f skipped", b"  continuation of info", b"ERROR x.py:2:f kept", b"Traceback (most recent call last):"]
+        assert [line_filter(line) for line in lines] == [False, False, True, True]
+
+    def test_pattern(self):
+        """Test regex filtering."""
+        line_filter = LineFilter(pattern=r"user=\d+")
+        assert line_filter(b"INFO a.py:1:f login user=42")
+        assert not line_filter(b"INFO a.py:1:f logout")
+
+
+class TestFollow:
+    """Test the multi-app follow generator."""
+
+    def test_multiple_apps(self, tmp_path, monkeypatch):
+        """Test that apps given by name under PY_LOG_PATH are followed together."""
+        monkeypatch.setenv("PY_LOG_PATH", str(tmp_path))
+        for app in ("a", "b"):
+            os.makedirs(tmp_path / app)
+            (tmp_path / app / "x.log").touch()
+
+        stop = threading.Event()
+        received = []
+
+        def writer():
+            _append(tmp_path / "a" / "x.log", "WARNING from a\n")
+            _append(tmp_path / "b" / "x.log", "DEBUG from b\nERROR from b\n")
+
+        generator = follow(["a", "b"], level=logging.WARNING, stop=stop, min_interval=0.01)
+        threading.Timer(0.05, writer).start()
+        for item in generator:
+            received.append(item)
+            if len(received) == 2:
+                stop.set()
+
+        assert sorted(received) == [("a", "WARNING from a"), ("b", "ERROR from b")]